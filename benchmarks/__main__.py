@@ -0,0 +1,68 @@
+"""
+Run the benchmark suite from the repository root:
+
+    python -m benchmarks                          # run everything and print timings
+    python -m benchmarks --quick -k forecast      # smaller sizes, only names containing "forecast"
+    python -m benchmarks --save main              # store benchmarks/baselines/main.json
+    python -m benchmarks --compare main           # run and report against that baseline
+
+--compare exits with status 1 when any case is slower or uses more memory than the
+baseline by more than --threshold, so it can gate CI.
+"""
+import argparse
+import sys
+from pathlib import Path
+from benchmarks.harness import compare_results, format_results, load_results, measure, save_results
+from benchmarks.suite import collect_benchmarks
+
+BASELINE_DIRECTORY = Path(__file__).resolve().parent / "baselines"
+
+
+def baseline_path(name: str) -> Path:
+    # Bare names live in benchmarks/baselines; anything path-like is used as given
+    path = Path(name)
+    if path.suffix == ".json" or len(path.parts) > 1:
+        return path
+    return BASELINE_DIRECTORY / f"{name}.json"
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Wealth forecast benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="Skip the largest sizes and the process-pool run")
+    parser.add_argument("--save", metavar="BASELINE", help="Store results as a baseline")
+    parser.add_argument("--compare", metavar="BASELINE", help="Report results against a stored baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged in comparisons")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timed round")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed rounds per benchmark")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak-memory pass")
+    arguments = parser.parse_args(argv)
+
+    results = []
+    for benchmark in collect_benchmarks(quick=arguments.quick):
+        if arguments.filter not in benchmark.name:
+            continue
+        print(f"running {benchmark.name} ...", file=sys.stderr, flush=True)
+        results.append(measure(benchmark, arguments.min_time, arguments.rounds, not arguments.no_memory))
+    print(format_results(results))
+
+    if arguments.save:
+        file_path = baseline_path(arguments.save)
+        save_results(results, file_path)
+        print(f"\nSaved baseline to {file_path}")
+
+    if arguments.compare:
+        baseline = load_results(baseline_path(arguments.compare))
+        if arguments.filter:
+            baseline["benchmarks"] = [result for result in baseline["benchmarks"] if arguments.filter in result["name"]]
+        report = compare_results(baseline["benchmarks"], results, arguments.threshold)
+        print(f"\nCompared with {arguments.compare} ({baseline['machine']['timestamp']}, "
+              f"Python {baseline['machine']['python']}, NumPy {baseline['machine']['numpy']})")
+        print(report.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+        if report["Status"].isin(["slower", "more memory"]).any():
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
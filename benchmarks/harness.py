@@ -0,0 +1,179 @@
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+
+class Benchmark:
+    """
+    One benchmark case.
+
+    Parameters:
+    - name: Unique id, e.g. "batch_amortization[n=10000]"; baselines are matched on it.
+    - group: Report section the case belongs to.
+    - setup: Zero-argument callable returning the zero-argument callable to time. Work done in
+      setup (building inputs, warming caches) is not measured.
+    - items: Units of work per call (loan-months, path-months, ...) for the throughput column.
+    - unit: Name of one item.
+    """
+
+    def __init__(self, name: str, group: str, setup, items: int = 1, unit: str = "call"):
+        self.name = name
+        self.group = group
+        self.setup = setup
+        self.items = items
+        self.unit = unit
+
+
+def measure(benchmark: Benchmark,
+            min_time: float = 0.2,
+            rounds: int = 5,
+            track_memory: bool = True) -> dict:
+    """
+    Time a benchmark the way timeit.autorange does: calls are batched until one batch takes at
+    least `min_time`, then `rounds` batches are timed. Peak traced memory comes from one extra,
+    untimed call under tracemalloc (NumPy reports its buffers to tracemalloc).
+    """
+    function = benchmark.setup()
+    function() # warm-up, also fills lazy imports and caches the way a second real call would see them
+
+    loops = 1
+    while True:
+        elapsed = _time_loops(function, loops)
+        if elapsed >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2
+    timings = [elapsed / loops] + [_time_loops(function, loops) / loops for _ in range(rounds - 1)]
+
+    peak_memory = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            function()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    median = statistics.median(timings)
+    return {"name": benchmark.name,
+            "group": benchmark.group,
+            "min": min(timings),
+            "median": median,
+            "mean": statistics.fmean(timings),
+            "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            "loops": loops,
+            "rounds": len(timings),
+            "items": benchmark.items,
+            "unit": benchmark.unit,
+            "throughput": benchmark.items / median if median > 0 else None,
+            "peak_memory": peak_memory}
+
+
+def _time_loops(function, loops: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def machine_info() -> dict:
+    return {"python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "timestamp": datetime.now().isoformat(timespec="seconds")}
+
+
+def save_results(results: list, file_path: Path):
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(file_path, "w") as file:
+        json.dump({"machine": machine_info(), "benchmarks": results}, file, indent=2)
+
+
+def load_results(file_path: Path) -> dict:
+    with open(file_path, "r") as file:
+        return json.load(file)
+
+
+def compare_results(baseline: list, current: list, threshold: float = 0.10) -> pd.DataFrame:
+    """
+    Join two result lists on benchmark name.
+
+    Time_Ratio is current / baseline median time, so above 1 means slower. A case is flagged
+    "slower" or "faster" when the ratio moves past `threshold` either way, and "more memory"
+    when its peak grows by more than `threshold`.
+    """
+    baseline = {result["name"]: result for result in baseline}
+    rows = []
+    for result in current:
+        before = baseline.pop(result["name"], None)
+        row = {"Group": result["group"],
+               "Benchmark": result["name"],
+               "Baseline_Median_ms": None,
+               "Current_Median_ms": result["median"] * 1e3,
+               "Time_Ratio": None,
+               "Baseline_Peak_MB": None,
+               "Current_Peak_MB": _megabytes(result["peak_memory"]),
+               "Memory_Ratio": None,
+               "Status": "new"}
+        if before is not None:
+            row["Baseline_Median_ms"] = before["median"] * 1e3
+            row["Time_Ratio"] = result["median"] / before["median"]
+            row["Baseline_Peak_MB"] = _megabytes(before["peak_memory"])
+            if before["peak_memory"] and result["peak_memory"] is not None:
+                row["Memory_Ratio"] = result["peak_memory"] / before["peak_memory"]
+            row["Status"] = _status(row["Time_Ratio"], row["Memory_Ratio"], threshold)
+        rows.append(row)
+    for before in baseline.values():
+        rows.append({"Group": before["group"], "Benchmark": before["name"],
+                     "Baseline_Median_ms": before["median"] * 1e3,
+                     "Baseline_Peak_MB": _megabytes(before["peak_memory"]),
+                     "Status": "missing"})
+    return pd.DataFrame(rows, columns=["Group", "Benchmark", "Baseline_Median_ms", "Current_Median_ms", "Time_Ratio",
+                                       "Baseline_Peak_MB", "Current_Peak_MB", "Memory_Ratio", "Status"])
+
+
+def _status(time_ratio: float, memory_ratio: float, threshold: float) -> str:
+    if time_ratio > 1 + threshold:
+        return "slower"
+    if memory_ratio is not None and memory_ratio > 1 + threshold:
+        return "more memory"
+    if time_ratio < 1 / (1 + threshold):
+        return "faster"
+    return "same"
+
+
+def _megabytes(number_of_bytes) -> float:
+    return None if number_of_bytes is None else number_of_bytes / 2**20
+
+
+def format_results(results: list) -> str:
+    frame = pd.DataFrame([{"Group": result["group"],
+                           "Benchmark": result["name"],
+                           "Median_ms": result["median"] * 1e3,
+                           "Min_ms": result["min"] * 1e3,
+                           "Stddev_ms": result["stddev"] * 1e3,
+                           "Throughput": _format_throughput(result),
+                           "Peak_MB": _megabytes(result["peak_memory"])} for result in results])
+    return frame.to_string(index=False, float_format=lambda value: f"{value:.3f}")
+
+
+def _format_throughput(result: dict) -> str:
+    if result["throughput"] is None:
+        return ""
+    return f"{result['throughput']:,.0f} {result['unit']}s/s"
@@ -0,0 +1,222 @@
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from benchmarks.harness import Benchmark
+from utilities.amortization import amortize, amortize_batch, home_value_path
+from utilities.config import load_inputs
+from utilities.households import HouseholdBatch
+from utilities.income import Income
+from utilities.loan import Loan
+from utilities.monte_carlo import simulate_wealth_bands
+from utilities.months import month_labels
+from utilities.mortgage import Mortgage
+from utilities.portfolio import Portfolio
+from utilities.scenarios import expand_grid, run_scenarios
+from utilities.snapshots import NumpySnapshotStore
+from utilities.tables import AccountTable
+
+REPOSITORY = Path(__file__).resolve().parents[1]
+INPUT_FILE = REPOSITORY / "inputs.json"
+
+SCHEDULE_TERMS = (120, 360, 480)
+BATCH_SIZES = (1, 100, 10_000, 100_000)
+FORECAST_HORIZONS = (60, 120, 360, 600)
+MONTE_CARLO_PATHS = (1_000, 10_000, 100_000)
+HOUSEHOLD_COUNTS = (100, 1_000, 10_000)
+DOMAIN_OBJECT_COUNT = 100_000
+# Fresh interpreters. Target: the CLI starts within 0.1 s of the bare `import numpy` floor.
+# The core import exits non-zero, failing the run, if anything on it pulls in pandas.
+COLD_STARTS = {
+    "python -m wealth_forecast --help": ["-m", "wealth_forecast", "--help"],
+    "import core": ["-c", "import sys, utilities.portfolio, utilities.simulation, utilities.mortgage, utilities.service; "
+                          "sys.exit('pandas' in sys.modules)"],
+    "import numpy": ["-c", "import numpy"],
+}
+SCENARIO_WORKERS = (0, 2)
+
+QUICK_BATCH_SIZES = (1, 100, 10_000)
+QUICK_FORECAST_HORIZONS = (60, 600)
+QUICK_MONTE_CARLO_PATHS = (1_000,)
+QUICK_HOUSEHOLD_COUNTS = (100, 1_000)
+QUICK_SCENARIO_WORKERS = (0,)
+
+
+def collect_benchmarks(quick: bool = False) -> list:
+    """
+    Every benchmark case. `quick` drops the largest sizes and the process-pool run so a
+    comparison finishes in well under a minute.
+    """
+    benchmarks = []
+    for term in SCHEDULE_TERMS:
+        benchmarks.append(Benchmark(f"loan_amortize[term={term}]", "schedule",
+                                    lambda term=term: lambda: amortize(289500, 0.0299, term),
+                                    items=term, unit="month"))
+        benchmarks.append(Benchmark(f"mortgage_schedule[term={term}]", "schedule",
+                                    lambda term=term: _mortgage_schedule(term, cached=False),
+                                    items=term, unit="month"))
+        benchmarks.append(Benchmark(f"mortgage_schedule_cached[term={term}]", "schedule",
+                                    lambda term=term: _mortgage_schedule(term, cached=True),
+                                    items=term, unit="month"))
+
+    for number_of_loans in (QUICK_BATCH_SIZES if quick else BATCH_SIZES):
+        for prepayments in (False, True):
+            name = "batch_amortization_prepaid" if prepayments else "batch_amortization"
+            benchmarks.append(Benchmark(f"{name}[n={number_of_loans}]", "batch",
+                                        lambda n=number_of_loans, p=prepayments: _batch_amortization(n, p),
+                                        items=number_of_loans * 120, unit="loan-month"))
+        benchmarks.append(Benchmark(f"batch_pmi[n={number_of_loans}]", "batch",
+                                    lambda n=number_of_loans: _batch_pmi(n),
+                                    items=number_of_loans * 360, unit="loan-month"))
+
+    for forecast_length in (QUICK_FORECAST_HORIZONS if quick else FORECAST_HORIZONS):
+        benchmarks.append(Benchmark(f"forecast[months={forecast_length}]", "forecast",
+                                    lambda months=forecast_length: _forecast(months),
+                                    items=forecast_length, unit="month"))
+
+    for number_of_paths in (QUICK_MONTE_CARLO_PATHS if quick else MONTE_CARLO_PATHS):
+        benchmarks.append(Benchmark(f"monte_carlo[paths={number_of_paths},months=600]", "monte_carlo",
+                                    lambda paths=number_of_paths: _monte_carlo(paths, 600),
+                                    items=number_of_paths * 600, unit="path-month"))
+
+    for number_of_households in (QUICK_HOUSEHOLD_COUNTS if quick else HOUSEHOLD_COUNTS):
+        benchmarks.append(Benchmark(f"households[n={number_of_households},months=360]", "households",
+                                    lambda n=number_of_households: _households(n, 360),
+                                    items=number_of_households * 360, unit="household-month"))
+
+    # Peak_MB is the footprint of holding every loan or income, as objects or as one table
+    for kind in ("loan", "income"):
+        for layout in ("objects", "table"):
+            benchmarks.append(Benchmark(f"{kind}_{layout}[n={DOMAIN_OBJECT_COUNT}]", "domain_objects",
+                                        lambda kind=kind, layout=layout: _domain_objects(kind, layout, DOMAIN_OBJECT_COUNT),
+                                        items=DOMAIN_OBJECT_COUNT, unit=kind))
+
+    for label, arguments in COLD_STARTS.items():
+        benchmarks.append(Benchmark(f"cold_start[{label}]", "startup",
+                                    lambda arguments=arguments: _cold_start(arguments), items=1, unit="start"))
+
+    for max_workers in (QUICK_SCENARIO_WORKERS if quick else SCENARIO_WORKERS):
+        benchmarks.append(Benchmark(f"scenarios[n=16,workers={max_workers}]", "scenarios",
+                                    lambda workers=max_workers: _scenarios(workers),
+                                    items=16, unit="scenario"))
+
+    benchmarks.append(Benchmark("current_wealth_csv", "current_wealth",
+                                lambda: _current_wealth_csv(), items=1, unit="read"))
+    benchmarks.append(Benchmark("current_wealth_snapshot_latest[history=600]", "current_wealth",
+                                lambda: _current_wealth_snapshot(600, latest=True), items=1, unit="read"))
+    benchmarks.append(Benchmark("current_wealth_snapshot_history[history=600]", "current_wealth",
+                                lambda: _current_wealth_snapshot(600, latest=False), items=600, unit="month"))
+    return benchmarks
+
+
+def _mortgage_schedule(term: int, cached: bool):
+    mortgage = Mortgage(initial_upb=320100, interest_rate=0.0299, term=term, monthly_escrow=697.33,
+                        origination_date="08-2020", recurring_prepayment=200)
+    if cached:
+        return mortgage.calculate_amortization_schedule
+    # Cold path: build the schedule without consulting the shared schedule cache
+    return lambda: mortgage._build_amortization_schedule(0, 0)
+
+
+def _batch_amortization(number_of_loans: int, prepayments: bool):
+    rng = np.random.default_rng(0)
+    initial_upb = rng.uniform(5_000, 500_000, number_of_loans)
+    interest_rate = rng.uniform(0.02, 0.08, number_of_loans)
+    recurring_prepayment = rng.uniform(0, 500, number_of_loans) if prepayments else 0
+    return lambda: amortize_batch(initial_upb, interest_rate, 120, recurring_prepayment=recurring_prepayment)
+
+
+def _batch_pmi(number_of_loans: int):
+    # PMI drop-off over 30-year schedules with a random appreciation rate per home
+    rng = np.random.default_rng(0)
+    initial_upb = rng.uniform(100_000, 500_000, number_of_loans)
+    schedule = amortize_batch(initial_upb, rng.uniform(0.02, 0.08, number_of_loans), 360)
+    home_value = home_value_path(initial_upb / rng.uniform(0.80, 0.97, number_of_loans),
+                                 rng.normal(0.03, 0.04, number_of_loans), 360)
+    return lambda: schedule.pmi(home_value, 95)
+
+
+def _forecast(forecast_length: int):
+    portfolio = Portfolio.from_inputs(load_inputs(INPUT_FILE))
+    return lambda: portfolio.to_simulation(forecast_length).run()
+
+
+def _monte_carlo(number_of_paths: int, forecast_length: int):
+    portfolio = Portfolio.from_inputs(load_inputs(INPUT_FILE))
+    simulation = portfolio.to_simulation(forecast_length)
+    return lambda: simulate_wealth_bands(simulation, portfolio.equities.names, number_of_paths,
+                                         annual_volatility=0.15, dtype=np.float32, seed=0)
+
+
+def _households(number_of_households: int, forecast_length: int):
+    # Every other household drops its car loan so the batch has ragged account sets
+    simulation = Portfolio.from_inputs(load_inputs(INPUT_FILE)).to_simulation(forecast_length)
+    names = simulation.liability_names + simulation.asset_names
+    without_car_loan = simulation.subset([name for name in names if name != "Car_Loan"])
+    batch = HouseholdBatch(forecast_length)
+    for household in range(number_of_households):
+        batch.add_household(household, simulation if household % 2 else without_car_loan)
+    return lambda: batch.run()
+
+
+def _domain_objects(kind: str, layout: str, count: int):
+    rng = np.random.default_rng(0)
+    amounts = rng.uniform(5_000, 500_000, count)
+    rates = rng.uniform(0.02, 0.08, count)
+    names = [str(index) for index in range(count)]
+    if kind == "loan":
+        columns = {column: dtype for column, dtype in Loan.TABLE_COLUMNS.items() if column != "origination_date"}
+        if layout == "objects":
+            return lambda: [Loan(amount, rate, 360, "08-2020") for amount, rate in zip(amounts.tolist(), rates.tolist())]
+        return lambda: AccountTable(**columns).extend(names, initial_upb=amounts, interest_rate=rates, term=360,
+                                                      current_upb=amounts, one_time_prepayment=0, recurring_prepayment=0)
+    if layout == "objects":
+        return lambda: [Income(amount, 100.0, "biweekly", rate) for amount, rate in zip(amounts.tolist(), rates.tolist())]
+    return lambda: AccountTable(**Income.TABLE_COLUMNS).extend(names, base_salary=amounts, paycheck_non401k_pre_tax_deductions=100.0,
+                                                               paycheck_schedule="biweekly", pre_tax_401k_contribution_rate=rates)
+
+
+def _cold_start(arguments: list):
+    return lambda: subprocess.run([sys.executable, *arguments], cwd=REPOSITORY, check=True, stdout=subprocess.DEVNULL)
+
+
+def _scenarios(max_workers: int):
+    with open(INPUT_FILE, "r") as file:
+        base_inputs = json.load(file)
+    scenarios = expand_grid({"mortgage.recurring_mortgage_prepayment": [0, 250, 500, 1000],
+                             "investments.avg_equity_return": [0.04, 0.06, 0.08, 0.10]})
+    return lambda: run_scenarios(base_inputs, scenarios, max_workers=max_workers)
+
+
+def _current_wealth_csv():
+    directory = tempfile.TemporaryDirectory()
+    file_path = Path(directory.name) / "current_wealth.csv"
+    _wealth_history(1).to_csv(file_path, index=False)
+
+    def read():
+        directory # keep the folder alive as long as the benchmark
+        return pd.read_csv(file_path)
+    return read
+
+
+def _current_wealth_snapshot(history_length: int, latest: bool):
+    directory = tempfile.TemporaryDirectory()
+    store = NumpySnapshotStore(directory.name)
+    store.append(_wealth_history(history_length))
+
+    def read():
+        directory
+        return store.read_latest() if latest else store.read_history()
+    return read
+
+
+def _wealth_history(number_of_months: int) -> pd.DataFrame:
+    columns = ["Total_Wealth", "Mortgage_UPB", "Student_Loan_UPB", "Car_Loan", "Emergency_Savings",
+               "Vacation_Savings", "CD", "Income_1_IRA1", "Income_1_401k", "Income_2_401k", "Brokerage_Account"]
+    frame = pd.DataFrame(np.random.default_rng(0).uniform(0, 300_000, (number_of_months, len(columns))),
+                         columns=columns)
+    frame.insert(0, "Date", month_labels(2020 * 12 + np.arange(number_of_months)))
+    return frame
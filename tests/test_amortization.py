@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from utilities.amortization import amortize_batch, monthly_payment
+
+
+def reference_schedule(initial_upb, interest_rate, term, recurring_prepayment=0, one_time_prepayment=0,
+                       one_time_prepayment_month=0, prepayment_start_month=0):
+    # One payment at a time, the way the forecast pays a loan down
+    payment = float(monthly_payment(initial_upb, interest_rate, term))
+    balance = float(initial_upb)
+    balances, prepayments = [], []
+    for month in range(term):
+        if balance <= 0:
+            break
+        interest = balance * interest_rate / 12
+        principal = balance if month == term - 1 else min(payment - interest, balance)
+        if month == one_time_prepayment_month and one_time_prepayment > 0:
+            extra = one_time_prepayment
+        else:
+            extra = recurring_prepayment if month >= prepayment_start_month else 0
+        extra = min(extra, balance - principal)
+        balance -= principal + extra
+        balances.append(balance)
+        prepayments.append(extra)
+    return np.array(balances), np.array(prepayments)
+
+
+LOANS = [
+    # initial_upb, interest_rate, term, recurring_prepayment, one_time_prepayment, one_time_prepayment_month, prepayment_start_month
+    (300000, 0.065, 360, 500, 10000, 24, 12),
+    (25000, 0.045, 120, 0, 5000, 0, 0),
+    (18000, 0.079, 60, 250, 0, 0, 6),
+]
+
+
+def test_batch_matches_the_loop_with_prepayments():
+    columns = [list(column) for column in zip(*LOANS)]
+    schedule = amortize_batch(*columns[:3], recurring_prepayment=columns[3], one_time_prepayment=columns[4],
+                              one_time_prepayment_month=columns[5], prepayment_start_month=columns[6])
+    for row, loan in enumerate(LOANS):
+        balances, prepayments = reference_schedule(*loan)
+        payments = len(balances)
+        assert schedule.payoff_month[row] == payments - 1
+        assert schedule.balance[row, :payments] == pytest.approx(balances, abs=1e-6)
+        assert schedule.prepayment[row, :payments] == pytest.approx(prepayments, abs=1e-6)
+        assert not schedule.balance[row, payments:].any()
+
+
+def test_prepayments_pay_off_early_and_save_interest():
+    plain, prepaid = (amortize_batch([300000], 0.065, 360, recurring_prepayment=amount) for amount in (0, 500))
+    assert plain.payoff_month[0] == 359
+    assert prepaid.payoff_month[0] < plain.payoff_month[0]
+    assert prepaid.interest_saved[0] > 0
+    assert plain.interest_saved[0] == pytest.approx(0, abs=1e-6)
@@ -0,0 +1,27 @@
+import copy
+import json
+from pathlib import Path
+import pytest
+from utilities.config import InputValidationError, parse_inputs
+
+INPUTS = json.loads((Path(__file__).parent.parent / "inputs.json").read_text())
+
+
+def test_every_error_is_reported_in_one_pass():
+    document = copy.deepcopy(INPUTS)
+    document["forecast"]["forecast_length"] = 0
+    document["income"]["income_1_pay_schedule"] = "fortnightly"
+    del document["mortgage"]["mortgage_interest_rate"]
+    document["car_loan"]["car_loan_initial_upb"] = "18000"
+    document["taxes"]["typo"] = 1
+    with pytest.raises(InputValidationError) as raised:
+        parse_inputs(document)
+    fields = sorted(error.split(":")[0] for error in raised.value.errors)
+    assert fields == ["car_loan.car_loan_initial_upb", "forecast.forecast_length", "income.income_1_pay_schedule",
+                      "mortgage.mortgage_interest_rate", "taxes.typo"]
+
+
+def test_pay_schedules_are_case_insensitive():
+    document = copy.deepcopy(INPUTS)
+    document["income"]["income_1_pay_schedule"] = "BiWeekly"
+    assert parse_inputs(document).income.income_1_pay_schedule == "biweekly"
@@ -0,0 +1,30 @@
+from utilities.schedule_cache import ScheduleCache, schedule_key
+
+
+def test_keys_ignore_argument_order():
+    assert schedule_key(initial_upb=1000, term=12) == schedule_key(term=12, initial_upb=1000)
+    assert schedule_key(initial_upb=1000, term=12) != schedule_key(initial_upb=1000, term=24)
+
+
+def test_disk_layer_serves_a_fresh_cache(tmp_path):
+    key = schedule_key(initial_upb=1000, term=12)
+    computed = []
+    def compute():
+        computed.append(key)
+        return [1.0, 2.0]
+
+    assert ScheduleCache(cache_dir=tmp_path).get_or_compute(key, compute) == [1.0, 2.0]
+    # A new process starts with an empty memory layer but the same directory
+    cache = ScheduleCache(cache_dir=tmp_path)
+    assert cache.get_or_compute(key, compute) == [1.0, 2.0]
+    assert cache.get_or_compute(key, compute) == [1.0, 2.0]
+    assert len(computed) == 1
+    assert cache.stats() == {"hits": 2, "disk_hits": 1, "misses": 0, "memory_entries": 1}
+
+
+def test_clear_removes_disk_entries(tmp_path):
+    cache = ScheduleCache(cache_dir=tmp_path)
+    key = schedule_key(initial_upb=1000, term=12)
+    cache.put(key, "schedule")
+    cache.clear()
+    assert ScheduleCache(cache_dir=tmp_path).get(key) is None
@@ -0,0 +1,45 @@
+import asyncio
+import copy
+import json
+from pathlib import Path
+from utilities.service import ForecastService
+
+INPUTS = json.loads((Path(__file__).parent.parent / "inputs.json").read_text())
+
+
+def post_forecast(document: dict):
+    async def request():
+        service = ForecastService()
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            body = json.dumps(document).encode()
+            writer.write(b"POST /forecast HTTP/1.1\r\nContent-Type: application/json\r\n"
+                         + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(payload)
+    return asyncio.run(request())
+
+
+def test_forecast_returns_every_month():
+    status, payload = post_forecast(INPUTS)
+    assert status == 200
+    assert len(payload["dates"]) == len(payload["values"]) == INPUTS["forecast"]["forecast_length"] + 1
+    assert payload["columns"][0] == "Total_Wealth"
+    assert payload["dates"][0] == payload["start_date"]
+
+
+def test_invalid_inputs_are_unprocessable():
+    document = copy.deepcopy(INPUTS)
+    document["forecast"]["forecast_length"] = 0
+    document["income"]["income_2_pay_schedule"] = "hourly"
+    status, payload = post_forecast(document)
+    assert status == 422
+    assert len(payload["errors"]) == 2
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from utilities.income import Income
+from utilities.payroll import IncomeTable
+from utilities.taxes import tax_engine
+
+# 2024 married filing jointly, by hand: 100,000 + 60,000 - 29,200 standard deduction = 130,800 taxable
+# 10% of 23,200 + 12% of (94,300 - 23,200) + 22% of (130,800 - 94,300) = 2,320 + 8,532 + 8,030
+JOINT_TAX = 18882.0
+
+
+def test_joint_filers_are_taxed_on_combined_income():
+    tax = tax_engine("married_filing_jointly").household_annual_tax([100000, 60000])
+    assert tax.sum() == pytest.approx(JOINT_TAX)
+    # Split in proportion to pay
+    assert tax == pytest.approx([JOINT_TAX * 100 / 160, JOINT_TAX * 60 / 160])
+
+
+def test_single_filers_are_taxed_separately():
+    # 85,400 and 45,400 after the 14,600 standard deduction
+    tax = tax_engine("single").household_annual_tax([100000, 60000])
+    assert tax == pytest.approx([1160 + 4266 + 8415, 1160 + 4056])
+
+
+def test_payroll_withholds_the_joint_tax():
+    incomes = IncomeTable()
+    incomes.add_incomes(["Income_1", "Income_2"], [100000, 60000], "monthly")
+    payroll = incomes.payroll(12, tax_engine("married_filing_jointly"), start_month=2024 * 12)
+    assert payroll.taxes.sum(axis=1) == pytest.approx(np.full(12, JOINT_TAX / 12))
+
+
+def test_take_home_pools_a_joint_filers_spouse_income():
+    income = Income(100000, 0, "monthly", 0)
+    take_home = income.derive_paycheck_take_home(tax_engine("married_filing_jointly"), other_annual_taxable_income=60000)
+    assert take_home == pytest.approx((100000 - JOINT_TAX * 100 / 160) / 12)
@@ -0,0 +1,306 @@
+import numpy as np
+from utilities.months import month_number
+
+# Loan-to-value thresholds for private mortgage insurance under the Homeowners Protection Act
+PMI_REQUEST_LTV = 0.80 # Borrower may request cancellation; loans originated at or below it carry no PMI
+PMI_AUTOMATIC_LTV = 0.78 # Servicer must cancel
+
+
+def monthly_payment(principal, annual_rate, term):
+    """
+    Level principal & interest payment for a fully amortizing loan.
+
+    Parameters:
+    - principal: Starting balance (scalar or array).
+    - annual_rate: Interest rate as a proportion of 1 (scalar or array).
+    - term: Number of monthly payments (scalar or array).
+    """
+    principal = np.asarray(principal, dtype=float)
+    monthly_rate = np.asarray(annual_rate, dtype=float) / 12
+    term = np.asarray(term, dtype=float)
+
+    # Zero-rate loans pay straight-line principal; mask them out of the annuity formula
+    safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+    annuity = principal * safe_rate / (1 - (1 + safe_rate) ** -term)
+    return np.where(monthly_rate == 0, principal / term, annuity)
+
+
+def balance_after(principal, annual_rate, term, months):
+    """
+    Closed-form unpaid balance after `months` scheduled payments.
+
+    Parameters:
+    - principal: Starting balance (scalar or array).
+    - annual_rate: Interest rate as a proportion of 1 (scalar or array).
+    - term: Number of monthly payments (scalar or array).
+    - months: Number of payments already made (scalar or array, broadcast against the loan inputs).
+    """
+    principal = np.asarray(principal, dtype=float)
+    monthly_rate = np.asarray(annual_rate, dtype=float) / 12
+    term = np.asarray(term, dtype=float)
+    months = np.minimum(np.asarray(months, dtype=float), term)
+    payment = monthly_payment(principal, annual_rate, term)
+
+    safe_rate = np.where(monthly_rate == 0, 1.0, monthly_rate)
+    growth = (1 + safe_rate) ** months
+    balance = principal * growth - payment * (growth - 1) / safe_rate
+    balance = np.where(monthly_rate == 0, principal - payment * months, balance)
+    # A loan at the end of its term is exactly paid off, not a floating point residue
+    return np.where(months >= term, 0.0, np.maximum(balance, 0.0))
+
+
+def amortize(principal: float, annual_rate: float, term: int):
+    """
+    Full interest/principal/balance vectors for a single level-payment loan.
+
+    Returns a tuple of (payment, interest, principal, balance) arrays of length `term`,
+    where index k describes payment k + 1 and `balance` is the UPB after that payment.
+    """
+    term = int(term)
+    months = np.arange(term + 1)
+    balances = balance_after(principal, annual_rate, term, months)
+    payment = np.full(term, float(monthly_payment(principal, annual_rate, term)))
+
+    interest = balances[:-1] * (float(annual_rate) / 12)
+    principal_paid = balances[:-1] - balances[1:]
+    return payment, interest, principal_paid, balances[1:]
+
+
+class BatchAmortization:
+    """
+    Loans x months amortization result for a book of loans.
+
+    Every 2-D array has shape (number of loans, longest term). Months after a loan's
+    term or payoff are zero-filled and flagged False in `mask`.
+    """
+
+    def __init__(self,
+                 initial_upb: np.ndarray,
+                 term: np.ndarray,
+                 start_month: np.ndarray,
+                 payment: np.ndarray,
+                 interest: np.ndarray,
+                 principal: np.ndarray,
+                 prepayment: np.ndarray,
+                 balance: np.ndarray,
+                 mask: np.ndarray):
+        self.initial_upb = initial_upb
+        self.term = term
+        self.start_month = start_month
+        self.payment = payment
+        self.interest = interest
+        self.principal = principal
+        self.prepayment = prepayment
+        self.balance = balance
+        self.mask = mask
+
+    def __len__(self):
+        return self.balance.shape[0]
+
+    def window(self, values: np.ndarray, start_month: int, length: int) -> np.ndarray:
+        """
+        Loans x `length` slice of `values` (e.g. self.principal) aligned to calendar months
+        start_month ... start_month + length - 1. Months outside a loan's schedule are zero.
+        """
+        offsets = (start_month - self.start_month)[:, None] + np.arange(length)[None, :]
+        inside = (offsets >= 0) & (offsets < values.shape[1])
+        rows = np.arange(values.shape[0])[:, None]
+        return np.where(inside, values[rows, np.clip(offsets, 0, values.shape[1] - 1)], 0)
+
+    @property
+    def opening_balance(self) -> np.ndarray:
+        # Balance each payment is charged against: the initial UPB, then the previous month's balance
+        return np.concatenate([self.initial_upb[:, None].astype(self.balance.dtype), self.balance[:, :-1]], axis=1)
+
+    def pmi(self, home_value, monthly_pmi, drop_ltv: float = PMI_AUTOMATIC_LTV):
+        """
+        Loans x months PMI charges and the payment index PMI drops off at; see pmi_charges.
+
+        Parameters:
+        - home_value: Loans x months home values, e.g. home_value_path(valuation, appreciation, months).
+        - monthly_pmi: PMI premium per loan (scalar or array).
+        """
+        return pmi_charges(self.opening_balance, home_value, monthly_pmi, drop_ltv)
+
+    @property
+    def payoff_month(self) -> np.ndarray:
+        # Zero-based payment index that brings each loan to a zero balance
+        return self.mask.sum(axis=1) - 1
+
+    @property
+    def total_interest(self) -> np.ndarray:
+        return self.interest.sum(axis=1, dtype=float)
+
+    @property
+    def interest_saved(self) -> np.ndarray:
+        # Scheduled interest over the full term is closed-form: payment * term - upb
+        scheduled_interest = self.payment * self.term - self.initial_upb
+        return scheduled_interest - self.total_interest
+
+
+def home_value_path(valuation, annual_appreciation, months: int) -> np.ndarray:
+    """
+    Home value at each of `months` payments, compounding `annual_appreciation` monthly from
+    `valuation` at payment 0.
+
+    Parameters:
+    - valuation: Home value at payment 0 (scalar or array, e.g. one per loan or per Monte Carlo path).
+    - annual_appreciation: Appreciation rate as a proportion of 1, broadcast against `valuation`.
+
+    Returns an array of shape valuation.shape + (months,).
+    """
+    valuation = np.asarray(valuation, dtype=float)[..., None]
+    annual_appreciation = np.asarray(annual_appreciation, dtype=float)[..., None]
+    return valuation * (1 + annual_appreciation) ** (np.arange(months) / 12)
+
+
+def pmi_charges(opening_balance, home_value, monthly_pmi, drop_ltv: float = PMI_AUTOMATIC_LTV):
+    """
+    PMI charged on each payment of an amortization schedule.
+
+    PMI is charged while the loan-to-value ratio is above `drop_ltv` and, once it drops off,
+    never comes back even if the home later loses value. Loans that start at or below
+    PMI_REQUEST_LTV never carry it. Computed as one mask over the whole schedule, so any
+    leading axes (loans, Monte Carlo paths) cost a single pass.
+
+    Parameters:
+    - opening_balance: Balance before each payment, months on the last axis.
+    - home_value: Home value at each payment, broadcast against `opening_balance`.
+    - monthly_pmi: PMI premium (scalar or array over the leading axes).
+    - drop_ltv: LTV at or below which PMI stops; PMI_REQUEST_LTV models cancelling on request.
+
+    Returns a tuple of (charges, drop_index): charges has the broadcast shape of the inputs,
+    drop_index is the first payment index without PMI - 0 if PMI is never charged, the number
+    of months if it is charged throughout.
+    """
+    ltv = np.asarray(opening_balance, dtype=float) / np.asarray(home_value, dtype=float)
+    required = ltv[..., :1] > PMI_REQUEST_LTV
+    dropped = np.logical_or.accumulate(ltv <= drop_ltv, axis=-1) | ~required
+    charges = np.where(dropped, 0.0, np.asarray(monthly_pmi, dtype=float)[..., None])
+    drop_index = np.where(dropped.any(axis=-1), dropped.argmax(axis=-1), ltv.shape[-1])
+    return charges, drop_index
+
+
+def amortize_batch(initial_upb,
+                   interest_rate,
+                   term,
+                   origination_date=None,
+                   recurring_prepayment=0,
+                   one_time_prepayment=0,
+                   one_time_prepayment_month=0,
+                   prepayment_start_month=0,
+                   dtype=np.float64) -> BatchAmortization:
+    """
+    Amortize many loans in one vectorized pass.
+
+    Parameters:
+    - initial_upb, interest_rate, term: One entry per loan (term in months).
+    - origination_date: Optional sequence of "MM-YYYY" strings / datetimes, kept as `start_month`.
+    - recurring_prepayment: Extra principal paid every month (scalar or per loan).
+    - one_time_prepayment: Extra principal paid once; like the forecast, it replaces the
+      recurring prepayment for that month rather than adding to it.
+    - one_time_prepayment_month: Zero-based payment index the one-time prepayment lands on.
+    - prepayment_start_month: Zero-based payment index the recurring prepayment starts from.
+    - dtype: Float dtype of the 2-D outputs; float32 halves memory for very large books.
+
+    Loans with shorter terms are padded and masked rather than looped over. Loans stop
+    at payoff, so `payoff_month` and `interest_saved` on the result reflect prepayments.
+    """
+    initial_upb = np.atleast_1d(np.asarray(initial_upb, dtype=float))
+    number_of_loans = initial_upb.shape[0]
+    interest_rate = np.broadcast_to(np.asarray(interest_rate, dtype=float), (number_of_loans,))
+    term = np.broadcast_to(np.asarray(term, dtype=int), (number_of_loans,))
+    recurring_prepayment = np.broadcast_to(np.asarray(recurring_prepayment, dtype=float), (number_of_loans,))
+    one_time_prepayment = np.broadcast_to(np.asarray(one_time_prepayment, dtype=float), (number_of_loans,))
+    one_time_prepayment_month = np.broadcast_to(np.asarray(one_time_prepayment_month, dtype=int), (number_of_loans,))
+    prepayment_start_month = np.broadcast_to(np.asarray(prepayment_start_month, dtype=int), (number_of_loans,))
+
+    if origination_date is None:
+        start_month = np.zeros(number_of_loans, dtype=int)
+    else:
+        start_month = np.array([month_number(date) for date in origination_date], dtype=int)
+
+    max_term = int(term.max()) if number_of_loans else 0
+    payment = monthly_payment(initial_upb, interest_rate, term)
+    months = np.arange(max_term)
+
+    if not recurring_prepayment.any() and not one_time_prepayment.any():
+        # No prepayments: every balance is closed-form, so the whole matrix is one broadcast
+        balances = balance_after(initial_upb[:, None], interest_rate[:, None], term[:, None],
+                                 np.arange(max_term + 1)[None, :])
+        mask = months[None, :] < term[:, None]
+        balance = np.where(mask, balances[:, 1:], 0.0).astype(dtype)
+        interest = np.where(mask, balances[:, :-1] * (interest_rate[:, None] / 12), 0.0).astype(dtype)
+        principal = np.where(mask, balances[:, :-1] - balances[:, 1:], 0.0).astype(dtype)
+        prepayment = np.zeros_like(balance)
+        return BatchAmortization(initial_upb, term, start_month, payment, interest, principal, prepayment, balance, mask)
+
+    # Prepayments change the balance path, so step month by month across all loans at once
+    balance = np.zeros((number_of_loans, max_term), dtype=dtype)
+    interest = np.zeros_like(balance)
+    principal = np.zeros_like(balance)
+    prepayment = np.zeros_like(balance)
+    mask = np.zeros((number_of_loans, max_term), dtype=bool)
+
+    monthly_rate = interest_rate / 12
+    remaining_balance = initial_upb.copy()
+    for month in months:
+        active = (month < term) & (remaining_balance > 0)
+        if not active.any():
+            break
+        month_interest = remaining_balance * monthly_rate
+        # Final scheduled payment clears any floating point residue
+        scheduled_principal = np.where(month == term - 1,
+                                       remaining_balance,
+                                       np.minimum(payment - month_interest, remaining_balance))
+        extra = np.where((month == one_time_prepayment_month) & (one_time_prepayment > 0),
+                         one_time_prepayment,
+                         np.where(month >= prepayment_start_month, recurring_prepayment, 0.0))
+        extra = np.minimum(extra, remaining_balance - scheduled_principal)
+
+        month_interest = np.where(active, month_interest, 0.0)
+        scheduled_principal = np.where(active, scheduled_principal, 0.0)
+        extra = np.where(active, extra, 0.0)
+        remaining_balance = remaining_balance - scheduled_principal - extra
+
+        interest[:, month] = month_interest
+        principal[:, month] = scheduled_principal
+        prepayment[:, month] = extra
+        balance[:, month] = remaining_balance
+        mask[:, month] = active
+
+    return BatchAmortization(initial_upb, term, start_month, payment, interest, principal, prepayment, balance, mask)
+
+
+def amortize_loans(loans: list, dtype=np.float64) -> BatchAmortization:
+    """
+    Batch-amortize a list of Loan / Mortgage objects from origination.
+    """
+    return amortize_batch(initial_upb=[loan.initial_upb for loan in loans],
+                          interest_rate=[loan.interest_rate for loan in loans],
+                          term=[loan.term for loan in loans],
+                          origination_date=[loan.origination_date for loan in loans],
+                          recurring_prepayment=[loan.recurring_prepayment for loan in loans],
+                          one_time_prepayment=[loan.one_time_prepayment for loan in loans],
+                          dtype=dtype)
+
+
+def prepayment_sweep(initial_upb: float,
+                     interest_rate: float,
+                     term: int,
+                     recurring_prepayments,
+                     prepayment_start_month: int = 0,
+                     dtype=np.float64) -> BatchAmortization:
+    """
+    Amortize one loan under many recurring prepayment amounts in a single batch call.
+
+    Row i of the result corresponds to recurring_prepayments[i]; read `payoff_month`
+    and `interest_saved` off the result to compare the options.
+    """
+    recurring_prepayments = np.atleast_1d(np.asarray(recurring_prepayments, dtype=float))
+    return amortize_batch(initial_upb=np.full(recurring_prepayments.shape[0], float(initial_upb)),
+                          interest_rate=interest_rate,
+                          term=term,
+                          recurring_prepayment=recurring_prepayments,
+                          prepayment_start_month=prepayment_start_month,
+                          dtype=dtype)
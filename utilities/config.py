@@ -0,0 +1,386 @@
+import dataclasses
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import get_args, get_origin, get_type_hints
+from utilities.instrumentation import instrumentation
+from utilities.payroll import CONTRIBUTION_BASES, PAYCHECKS_PER_YEAR
+from utilities.taxes import FEDERAL_BRACKETS, STATE_BRACKETS
+
+RATE = {"minimum": 0.0, "maximum": 1.0}
+AMOUNT = {"minimum": 0.0}
+PAY_SCHEDULE = {"choices": tuple(PAYCHECKS_PER_YEAR), "normalize": str.lower} # "Biweekly" parses as "biweekly"
+DATE_PATTERN = re.compile(r"^(0?[1-9]|1[0-2])-\d{4}$")
+
+
+class InputValidationError(ValueError):
+    """
+    Raised with every problem found in an inputs document, not just the first.
+    """
+
+    def __init__(self, errors: list):
+        self.errors = errors
+        super().__init__("Invalid inputs:\n" + "\n".join(f"  - {error}" for error in errors))
+
+    def __reduce__(self):
+        # Rebuild from the error list when crossing a process boundary
+        return type(self), (self.errors,)
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastConfig:
+    forecast_length: int = field(metadata={"minimum": 1})
+
+
+@dataclass(frozen=True, slots=True)
+class IncomeConfig:
+    income_1_base_amount: float = field(metadata=AMOUNT)
+    income_2_base_amount: float = field(metadata=AMOUNT)
+    income_1_pay_schedule: str = field(metadata=PAY_SCHEDULE)
+    income_2_pay_schedule: str = field(metadata=PAY_SCHEDULE)
+    income_1_paycheck_non401k_pre_tax_deductions: float = field(metadata=AMOUNT)
+    income_2_paycheck_non401k_pre_tax_deductions: float = field(metadata=AMOUNT)
+
+
+@dataclass(frozen=True, slots=True)
+class MortgageConfig:
+    mortgage_origination_date: str
+    mortgage_length: int = field(metadata={"minimum": 1})
+    mortgage_interest_rate: float = field(metadata=RATE)
+    mortgage_initial_upb: float = field(metadata=AMOUNT)
+    mortgage_current_upb: float = field(metadata=AMOUNT)
+    mortgage_prepayment_this_month: float = field(metadata=AMOUNT)
+    current_monthly_escrow: float = field(metadata=AMOUNT)
+    monthly_pmi: float = field(metadata=AMOUNT)
+    recorded_home_valuation: float = field(metadata=AMOUNT)
+    mortgage_one_time_prepayment: float = field(metadata=AMOUNT)
+    recurring_mortgage_prepayment: float = field(metadata=AMOUNT)
+    home_appreciation_rate: float = field(default=0.0, metadata={"minimum": -1.0, "maximum": 1.0})
+    pmi_drop_ltv: float = field(default=0.78, metadata=RATE)
+
+
+@dataclass(frozen=True, slots=True)
+class StudentLoanConfig:
+    student_loan_origination_date: str
+    student_loan_avg_interest_rate: float = field(metadata=RATE)
+    student_loan_initial_upb: float = field(metadata=AMOUNT)
+    student_loan_current_upb: float = field(metadata=AMOUNT)
+    student_loan_term: int = field(metadata={"minimum": 1})
+    student_loan_prepayment_this_month: float = field(metadata=AMOUNT)
+    student_loan_recurring_prepayment: float = field(metadata=AMOUNT)
+
+
+@dataclass(frozen=True, slots=True)
+class CarLoanConfig:
+    car_loan_origination_date: str
+    car_loan_initial_upb: float = field(metadata=AMOUNT)
+    car_loan_interest_rate: float = field(metadata=RATE)
+    car_loan_term_length: int = field(metadata={"minimum": 1})
+    car_loan_current_upb: float = field(metadata=AMOUNT)
+    car_loan_one_time_prepayment: float = field(metadata=AMOUNT)
+    car_loan_recurring_prepayment: float = field(metadata=AMOUNT)
+
+
+@dataclass(frozen=True, slots=True)
+class SavingsAccountConfig:
+    current_account_value: float = field(metadata=AMOUNT)
+    current_account_interest_rate: float = field(metadata=RATE)
+    income1_base_monthly_contribution: float = field(metadata=AMOUNT)
+    income1_base_monthly_contribution_percent: float = field(metadata=RATE)
+    income1_base_monthly_deduction: float = field(metadata=AMOUNT)
+    income1_base_monthly_deduction_percent: float = field(metadata=RATE)
+    income1_current_month_contribution: float = field(metadata=AMOUNT)
+    income1_current_month_deduction: float = field(metadata=AMOUNT)
+    income2_base_monthly_contribution: float = field(metadata=AMOUNT)
+    income2_base_monthly_contribution_percent: float = field(metadata=RATE)
+    income2_base_monthly_deduction: float = field(metadata=AMOUNT)
+    income2_base_monthly_deduction_percent: float = field(metadata=RATE)
+    income2_current_month_contribution: float = field(metadata=AMOUNT)
+    income2_current_month_deduction: float = field(metadata=AMOUNT)
+
+
+@dataclass(frozen=True, slots=True)
+class SavingsConfig:
+    account_1: SavingsAccountConfig
+    account_2: SavingsAccountConfig
+    cd: SavingsAccountConfig
+
+
+@dataclass(frozen=True, slots=True)
+class FourZeroOneKayConfig:
+    current_acct_value: float = field(metadata=AMOUNT)
+    employee_contribution_pct: float = field(metadata=RATE)
+    employer_contribution_pct: float = field(metadata=RATE)
+
+
+@dataclass(frozen=True, slots=True)
+class Active401ksConfig:
+    income_1: FourZeroOneKayConfig
+    income_2: FourZeroOneKayConfig
+
+
+@dataclass(frozen=True, slots=True)
+class IraConfig:
+    current_acct_value: float = field(metadata=AMOUNT)
+    current_monthly_contribution: float = field(metadata=AMOUNT)
+
+
+@dataclass(frozen=True, slots=True)
+class IrasConfig:
+    ira_1: IraConfig
+    ira_2: IraConfig
+
+
+@dataclass(frozen=True, slots=True)
+class InvestmentsConfig:
+    avg_equity_return: float = field(metadata={"minimum": -1.0, "maximum": 1.0})
+    active_401ks: Active401ksConfig
+    iras: IrasConfig
+    brokerage_acct_value: float = field(default=0.0, metadata=AMOUNT)
+
+
+@dataclass(frozen=True, slots=True)
+class TaxConfig:
+    marginal_tax_rate: float = field(metadata=RATE)
+    filing_status: str = field(default=None, metadata={"choices": FEDERAL_BRACKETS}) # None keeps the flat marginal rate
+    state: str = field(default=None, metadata={"choices": STATE_BRACKETS})
+
+
+@dataclass(frozen=True, slots=True)
+class IncomeEntryConfig:
+    name: str
+    base_salary: float = field(metadata=AMOUNT)
+    paycheck_schedule: str = field(metadata=PAY_SCHEDULE)
+    paycheck_non401k_pre_tax_deductions: float = field(default=0.0, metadata=AMOUNT)
+    pre_tax_401k_contribution_rate: float = field(default=0.0, metadata=RATE)
+    employer_match_rate: float = field(default=0.0, metadata=RATE)
+    annual_raise: float = field(default=0.0, metadata=RATE)
+    raise_month: int = field(default=1, metadata={"minimum": 1, "maximum": 12}) # Calendar month raises take effect
+
+
+@dataclass(frozen=True, slots=True)
+class SavingsEntryConfig:
+    name: str
+    current_account_value: float = field(metadata=AMOUNT)
+    current_account_interest_rate: float = field(metadata=RATE)
+    monthly_contribution: float = 0.0
+    income: str = None
+    contribution_percent: float = field(default=0.0, metadata=RATE)
+    contribution_basis: str = field(default="gross", metadata={"choices": CONTRIBUTION_BASES})
+
+
+@dataclass(frozen=True, slots=True)
+class EquityEntryConfig:
+    name: str
+    current_acct_value: float = field(metadata=AMOUNT)
+    average_return: float = field(metadata={"minimum": -1.0, "maximum": 1.0})
+    monthly_contribution: float = 0.0
+    income: str = None
+    employee_contribution_pct: float = field(default=0.0, metadata=RATE)
+    employer_contribution_pct: float = field(default=0.0, metadata=RATE)
+    contribution_basis: str = field(default="gross", metadata={"choices": CONTRIBUTION_BASES})
+
+
+@dataclass(frozen=True, slots=True)
+class LoanEntryConfig:
+    name: str
+    current_upb: float = field(metadata=AMOUNT)
+    interest_rate: float = field(metadata=RATE)
+    monthly_payment: float = field(metadata=AMOUNT)
+    recurring_prepayment: float = field(default=0.0, metadata=AMOUNT)
+    one_time_prepayment: float = field(default=0.0, metadata=AMOUNT)
+    redirect_to: str = None
+
+
+@dataclass(frozen=True, slots=True)
+class PortfolioConfig:
+    incomes: tuple[IncomeEntryConfig, ...] = ()
+    savings: tuple[SavingsEntryConfig, ...] = ()
+    equities: tuple[EquityEntryConfig, ...] = ()
+    loans: tuple[LoanEntryConfig, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class PortfolioInputs:
+    forecast: ForecastConfig
+    portfolio: PortfolioConfig
+    taxes: TaxConfig = None
+
+
+@dataclass(frozen=True, slots=True)
+class HouseholdInputs:
+    forecast: ForecastConfig
+    income: IncomeConfig
+    mortgage: MortgageConfig
+    student_loans: StudentLoanConfig
+    car_loan: CarLoanConfig
+    savings: SavingsConfig
+    investments: InvestmentsConfig
+    taxes: TaxConfig
+
+
+def _parse_section(config_class, data, path: str, errors: list):
+    if not isinstance(data, dict):
+        errors.append(f"{path or 'document'}: expected an object, got {type(data).__name__}")
+        return None
+
+    type_hints = get_type_hints(config_class)
+    values = {}
+    for config_field in dataclasses.fields(config_class):
+        name = config_field.name
+        field_path = f"{path}.{name}" if path else name
+        expected_type = type_hints[name]
+        if name not in data:
+            if config_field.default is not dataclasses.MISSING:
+                values[name] = config_field.default
+            else:
+                errors.append(f"{field_path}: missing")
+            continue
+        value = data[name]
+        if value is None and config_field.default is None:
+            values[name] = None
+            continue
+
+        if dataclasses.is_dataclass(expected_type):
+            values[name] = _parse_section(expected_type, value, field_path, errors)
+            continue
+        if get_origin(expected_type) is tuple:
+            # Variable-length sections, e.g. tuple[SavingsEntryConfig, ...], are JSON lists
+            if not isinstance(value, list):
+                errors.append(f"{field_path}: expected a list, got {type(value).__name__}")
+                continue
+            entry_type = get_args(expected_type)[0]
+            values[name] = tuple(_parse_section(entry_type, entry, f"{field_path}[{index}]", errors)
+                                 for index, entry in enumerate(value))
+            continue
+        if expected_type in (int, float):
+            # bool is an int subclass but never a valid amount, rate or count
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                errors.append(f"{field_path}: expected a number, got {value!r}")
+                continue
+            if expected_type is int and value != int(value):
+                errors.append(f"{field_path}: expected a whole number, got {value!r}")
+                continue
+            value = expected_type(value)
+            minimum = config_field.metadata.get("minimum")
+            maximum = config_field.metadata.get("maximum")
+            if minimum is not None and value < minimum:
+                errors.append(f"{field_path}: must be at least {minimum}, got {value!r}")
+            if maximum is not None and value > maximum:
+                errors.append(f"{field_path}: must be at most {maximum}, got {value!r}")
+        elif expected_type is str:
+            if not isinstance(value, str):
+                errors.append(f"{field_path}: expected a string, got {value!r}")
+                continue
+            if name.endswith("_date") and not DATE_PATTERN.match(value):
+                errors.append(f"{field_path}: expected MM-YYYY, got {value!r}")
+            normalize = config_field.metadata.get("normalize")
+            if normalize is not None:
+                value = normalize(value)
+            choices = config_field.metadata.get("choices")
+            if choices is not None and value not in choices:
+                errors.append(f"{field_path}: must be one of {', '.join(choices)}, got {value!r}")
+        values[name] = value
+
+    known_fields = {config_field.name for config_field in dataclasses.fields(config_class)}
+    for name in data:
+        if name not in known_fields:
+            errors.append(f"{path + '.' if path else ''}{name}: unknown input")
+
+    if len(values) != len(known_fields):
+        return None
+    return config_class(**values)
+
+
+def parse_inputs(document: dict):
+    """
+    Validate a parsed inputs.json document in one pass.
+
+    Documents with a "portfolio" section declare any number of accounts and parse to
+    PortfolioInputs; the original fixed layout parses to HouseholdInputs.
+    Raises InputValidationError listing every missing, mistyped, out-of-range or unknown input.
+    """
+    errors = []
+    schema = PortfolioInputs if isinstance(document, dict) and "portfolio" in document else HouseholdInputs
+    inputs = _parse_section(schema, document, "", errors)
+    if errors:
+        raise InputValidationError(errors)
+    return inputs
+
+
+# Parsed inputs keyed on resolved path, reused while the file's mtime and size are unchanged
+_parsed_inputs_cache = {}
+
+
+def load_inputs(file_path: Path):
+    """
+    Load and validate one inputs file, reusing the cached parse when the file has not changed.
+    Files whose mtime moved but whose bytes are identical are recognized by content hash.
+    """
+    file_path = Path(file_path).resolve()
+    status = os.stat(file_path)
+    stamp = (status.st_mtime_ns, status.st_size)
+    cached = _parsed_inputs_cache.get(file_path)
+    if cached is not None and cached[0] == stamp:
+        instrumentation.count("inputs.cache_hits")
+        return cached[2]
+
+    with open(file_path, "rb") as file:
+        raw = file.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached is not None and cached[1] == digest:
+        instrumentation.count("inputs.cache_hits")
+        inputs = cached[2]
+    else:
+        instrumentation.count("inputs.parsed")
+        try:
+            with instrumentation.span("inputs.parse"):
+                inputs = parse_inputs(json.loads(raw))
+        except InputValidationError as error:
+            raise InputValidationError([f"{file_path.name}: {message}" for message in error.errors])
+    _parsed_inputs_cache[file_path] = (stamp, digest, inputs)
+    return inputs
+
+
+def _load_inputs_or_error(file_path: Path):
+    try:
+        return load_inputs(file_path)
+    except (InputValidationError, json.JSONDecodeError) as error:
+        return error
+
+
+def load_input_directory(directory: Path,
+                         pattern: str = "*.json",
+                         max_workers: int = 0,
+                         raise_errors: bool = True) -> dict:
+    """
+    Load every household inputs file in a directory.
+
+    Parameters:
+    - max_workers: Parse files across this many processes; 0 parses in this process, which
+      also lets unchanged files come straight from the parse cache.
+    - raise_errors: Raise one InputValidationError covering every bad file. When False, bad
+      files map to their error instead.
+    """
+    file_paths = sorted(Path(directory).glob(pattern))
+    if max_workers:
+        # multiprocessing is slow to import and only needed here
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(file_paths, executor.map(_load_inputs_or_error, file_paths, chunksize=64)))
+    else:
+        results = {file_path: _load_inputs_or_error(file_path) for file_path in file_paths}
+
+    if raise_errors:
+        errors = []
+        for file_path, result in results.items():
+            if isinstance(result, InputValidationError):
+                errors.extend(result.errors)
+            elif isinstance(result, json.JSONDecodeError):
+                errors.append(f"{file_path.name}: not valid JSON ({result})")
+        if errors:
+            raise InputValidationError(errors)
+    return results
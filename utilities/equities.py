@@ -1,28 +1,52 @@
+from utilities.income import Income
 
 class EquityInvestment:
+
+    __slots__ = ("existing_investment", "average_return")
+    TABLE_COLUMNS = {"existing_investment": float, "average_return": float}
     
     def __init__(self, 
                  existing_investment: float, 
-                 average_return: avg_equity_return):
+                 average_return: float):
         self.existing_investment = existing_investment
         self.average_return = average_return
 
 class FourZeroOneKay(EquityInvestment):
+
+    __slots__ = ("income", "base_monthly_contribution_percent", "employer_match_percent",
+                 "_employee_contribution", "_employer_contribution")
+    TABLE_COLUMNS = {"income": object, "existing_investment": float, "base_monthly_contribution_percent": float,
+                     "employer_match_percent": float, "average_return": float}
     
     def __init__(self, 
                  income: Income,
                  existing_investment: float, 
                  base_monthly_contribution_percent: float, 
-                 employer_match_percent: float):
-        super().__init__(existing_investment, average_return=avg_equity_return)
+                 employer_match_percent: float,
+                 average_return: float = 0):
+        super().__init__(existing_investment, average_return=average_return)
         self.income = income
         self.base_monthly_contribution_percent = base_monthly_contribution_percent
-        self.employer_match_percent = employer_match_percent 
-        self.base_monthly_contribution_percent = base_monthly_contribution_percent
         self.employer_match_percent = employer_match_percent
-        self.employee_contribution = self.calculate_monthly_base_contribution()
-        self.employer_contribution = self.calculate_employer_contribution()
-        self.total_monthly_contributions = self.calculate_monthly_total_contribution()
+        # Contributions are computed on first access and kept
+        self._employee_contribution = None
+        self._employer_contribution = None
+    
+    @property
+    def employee_contribution(self) -> float:
+        if self._employee_contribution is None:
+            self._employee_contribution = self.calculate_monthly_base_contribution()
+        return self._employee_contribution
+    
+    @property
+    def employer_contribution(self) -> float:
+        if self._employer_contribution is None:
+            self._employer_contribution = self.calculate_employer_contribution()
+        return self._employer_contribution
+    
+    @property
+    def total_monthly_contributions(self) -> float:
+        return self.calculate_monthly_total_contribution()
     
     def calculate_monthly_base_contribution(self)->float:
         employee_contribution = self.income.base_salary * self.base_monthly_contribution_percent/12
@@ -37,27 +61,56 @@ class FourZeroOneKay(EquityInvestment):
         return total
     
 class RothIRA(EquityInvestment):
+
+    __slots__ = ("income", "base_monthly_contribution_percent", "employer_match_percent", "marginal_tax_rate",
+                 "tax_engine", "spouse_income", "_employer_contribution", "_post_tax_employee_contribution")
+    TABLE_COLUMNS = {"income": object, "existing_investment": float, "base_monthly_contribution_percent": float,
+                     "employer_match_percent": float, "average_return": float, "marginal_tax_rate": float,
+                     "tax_engine": object, "spouse_income": object}
     
     def __init__(self, 
                  income: Income,
                  existing_investment: float, 
                  base_monthly_contribution_percent: float = 0, 
-                 employer_match_percent: float = 0):
-        super().__init__(existing_investment, average_return=avg_equity_return)
+                 employer_match_percent: float = 0,
+                 average_return: float = 0,
+                 marginal_tax_rate: float = 0,
+                 tax_engine=None,
+                 spouse_income: Income = None):
+        super().__init__(existing_investment, average_return=average_return)
         self.income = income
         self.base_monthly_contribution_percent = base_monthly_contribution_percent
-        self.employer_match_percent = employer_match_percent 
-        self.base_monthly_contribution_percent=base_monthly_contribution_percent
-        self.employer_match_percent = self.employer_match_percent
-        self.employer_contribution = self.calculate_employer_contribution()
-        self.post_tax_employee_contribution = self.calculate_post_tax_employee_contribution()
-        self.total_monthly_contribution = self.calculate_monthly_total_contribution
+        self.employer_match_percent = employer_match_percent
+        self.marginal_tax_rate = marginal_tax_rate # Applied to the post-tax employee contribution without a tax_engine
+        self.tax_engine = tax_engine # utilities.taxes.TaxEngine; takes precedence over marginal_tax_rate
+        self.spouse_income = spouse_income # Pooled with `income` when tax_engine files jointly
+        # Contributions are computed on first access and kept
+        self._employer_contribution = None
+        self._post_tax_employee_contribution = None
+    
+    @property
+    def employer_contribution(self) -> float:
+        if self._employer_contribution is None:
+            self._employer_contribution = self.calculate_employer_contribution()
+        return self._employer_contribution
+    
+    @property
+    def post_tax_employee_contribution(self) -> float:
+        if self._post_tax_employee_contribution is None:
+            self._post_tax_employee_contribution = self.calculate_post_tax_employee_contribution()
+        return self._post_tax_employee_contribution
+    
+    @property
+    def total_monthly_contribution(self) -> float:
+        return self.calculate_monthly_total_contribution()
             
     def calculate_post_tax_employee_contribution(self) ->float:
-        return self.income.paycheck_taxable_income * (1-marginal_tax_rate)
+        spouse_taxable_income = (0 if self.spouse_income is None
+                                 else self.spouse_income.paycheck_taxable_income * self.spouse_income.number_of_paychecks)
+        return self.income.derive_paycheck_take_home(self.tax_engine, self.marginal_tax_rate, spouse_taxable_income)
 
     def calculate_employer_contribution(self) -> float:
         return self.employer_match_percent * self.income.paycheck_taxable_income
 
     def calculate_monthly_total_contribution(self) -> float:
-        return self.post_tax_employee_contribution + self.employer_contribution
\ No newline at end of file
+        return self.post_tax_employee_contribution + self.employer_contribution
@@ -0,0 +1,162 @@
+import numpy as np
+from utilities.amortization import balance_after, prepayment_sweep
+from utilities.months import current_month, month_number
+
+
+class GoalSeekResult:
+    """
+    Parameters:
+    - value: Input that meets the target (the best bound found if not converged).
+    - metric: Metric at `value`.
+    - evaluations: Number of forecast evaluations spent (a batch counts once).
+    - converged: Whether the tolerance was reached within the evaluation budget.
+    """
+
+    def __init__(self, value: float, metric: float, evaluations: int, converged: bool):
+        self.value = value
+        self.metric = metric
+        self.evaluations = evaluations
+        self.converged = converged
+
+    def __repr__(self):
+        return (f"GoalSeekResult(value={self.value:.4f}, metric={self.metric:.4f}, "
+                f"evaluations={self.evaluations}, converged={self.converged})")
+
+
+def goal_seek(evaluate,
+              target: float,
+              low: float,
+              high: float,
+              tolerance: float = 0.01,
+              metric_tolerance: float = 0.01,
+              method: str = "newton",
+              max_evaluations: int = 60) -> GoalSeekResult:
+    """
+    Find the input in [low, high] where a monotone `evaluate(input) -> metric` hits `target`.
+
+    Parameters:
+    - tolerance: Stop once the bracket around the answer is this narrow (input units).
+    - metric_tolerance: Or once the metric is this close to the target.
+    - method: "newton" steps along the secant through the bracket ends (the derivative of a
+      forecast is its finite difference), and bisects whenever the same end moves twice in a
+      row so it cannot stall; "bisection" always halves. Forecast balances are linear in
+      contributions, so Newton usually lands in one or two steps.
+    """
+    if method not in ("newton", "bisection"):
+        raise ValueError(f"Unknown goal seek method '{method}'. Use newton or bisection.")
+    low_error = evaluate(low) - target
+    high_error = evaluate(high) - target
+    evaluations = 2
+    if abs(low_error) <= metric_tolerance:
+        return GoalSeekResult(low, low_error + target, evaluations, True)
+    if abs(high_error) <= metric_tolerance:
+        return GoalSeekResult(high, high_error + target, evaluations, True)
+    if np.sign(low_error) == np.sign(high_error):
+        raise ValueError(f"Target {target} is not between evaluate({low}) = {low_error + target:.4f} "
+                         f"and evaluate({high}) = {high_error + target:.4f}.")
+
+    moved, repeats = None, 0
+    while evaluations < max_evaluations and high - low > tolerance:
+        if method == "newton" and repeats < 2:
+            guess = high - high_error * (high - low) / (high_error - low_error)
+            # Keep the step strictly inside the bracket so the bracket always shrinks
+            margin = min(tolerance / 2, (high - low) / 4)
+            guess = min(max(guess, low + margin), high - margin)
+        else:
+            guess = (low + high) / 2
+
+        error = evaluate(guess) - target
+        evaluations += 1
+        if abs(error) <= metric_tolerance:
+            return GoalSeekResult(guess, error + target, evaluations, True)
+        side = "low" if np.sign(error) == np.sign(low_error) else "high"
+        if side == "low":
+            low, low_error = guess, error
+        else:
+            high, high_error = guess, error
+        repeats = repeats + 1 if side == moved else 0
+        moved = side
+
+    best, best_error = (low, low_error) if abs(low_error) < abs(high_error) else (high, high_error)
+    return GoalSeekResult(best, best_error + target, evaluations, high - low <= tolerance)
+
+
+def required_prepayment(loan,
+                        payoff_by: int,
+                        tolerance: float = 0.01,
+                        candidates: int = 64,
+                        max_evaluations: int = 10) -> GoalSeekResult:
+    """
+    Smallest recurring prepayment, starting this month, that pays `loan` off by `payoff_by`.
+
+    Payoff month is a step function of the prepayment, so this is a bisection on "paid off in
+    time" that tests `candidates` prepayments per evaluation in one batched amortization
+    (utilities.amortization.prepayment_sweep). Each evaluation narrows the bracket by a factor
+    of `candidates`, so cents are reached in three or four evaluations.
+
+    Parameters:
+    - loan: Loan or Mortgage (initial_upb, interest_rate, term, origination_date).
+    - payoff_by: Month number (see utilities.months) of the last payment allowed.
+    """
+    origination = month_number(loan.origination_date)
+    prepayment_start = max(current_month() - origination, 0)
+    target_index = payoff_by - origination
+    if target_index < prepayment_start:
+        raise ValueError("payoff_by is before the first month a prepayment can be made.")
+
+    def payoff_index(prepayments):
+        return prepayment_sweep(loan.initial_upb, loan.interest_rate, loan.term, prepayments,
+                                prepayment_start_month=prepayment_start).payoff_month
+
+    scheduled_payoff = int(payoff_index([0.0])[0])
+    if scheduled_payoff <= target_index:
+        return GoalSeekResult(0.0, float(scheduled_payoff + origination), 1, True)
+    # Prepaying the whole remaining balance in the first month always pays off immediately
+    low, high = 0.0, float(balance_after(loan.initial_upb, loan.interest_rate, loan.term, prepayment_start))
+    evaluations = 1
+    while high - low > tolerance and evaluations < max_evaluations:
+        prepayments = np.linspace(low, high, candidates)
+        on_time = payoff_index(prepayments) <= target_index
+        evaluations += 1
+        first = int(on_time.argmax()) # on_time is monotone and its last entry is always True
+        low, high = (prepayments[first - 1] if first > 0 else low), prepayments[first]
+
+    high = float(np.ceil(high / tolerance) * tolerance) if tolerance > 0 else high
+    return GoalSeekResult(high, float(payoff_index([high])[0] + origination), evaluations + 1, high - low <= 2 * tolerance)
+
+
+def required_contribution(portfolio,
+                          account: str,
+                          target_balance: float,
+                          month: int,
+                          parameter: str = "contribution_percent",
+                          high: float = None,
+                          tolerance: float = 1e-6,
+                          metric_tolerance: float = 1.0) -> GoalSeekResult:
+    """
+    Contribution to a savings or equity account in `portfolio` that makes its balance reach
+    `target_balance` after `month` forecast months.
+
+    Parameters:
+    - parameter: "contribution_percent" (share of the linked income, e.g. a 401k
+      base_monthly_contribution_percent) or "monthly_contribution" (fixed dollars).
+    - high: Upper end of the search; defaults to 100% for percentages and the target balance
+      for fixed contributions.
+    - metric_tolerance: Dollars from the target that count as reached.
+
+    The portfolio is restored to its original value afterwards.
+    """
+    accounts = portfolio.savings if account in portfolio.savings.names else portfolio.equities
+    index = accounts.index(account)
+    original = accounts[parameter][index]
+    if high is None:
+        high = 1.0 if parameter == "contribution_percent" else float(target_balance)
+
+    def balance_at(value):
+        accounts[parameter][index] = value
+        return portfolio.to_simulation(month).run().column(account)[month]
+
+    try:
+        return goal_seek(balance_at, target_balance, 0.0, high, tolerance, metric_tolerance)
+    finally:
+        accounts[parameter][index] = original
@@ -0,0 +1,205 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from utilities.instrumentation import instrumentation
+from utilities.months import MonthCalendar
+from utilities.simulation import Simulation, SimulationResult, advance_accounts
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class HouseholdBatchResult:
+    """
+    Households x months x columns array of many forecasts. Columns are Total_Wealth, then every
+    liability name, then every asset name seen in any household; `present` marks which of
+    them each household actually has.
+    """
+
+    def __init__(self,
+                 household_ids: list,
+                 columns: list,
+                 values: np.ndarray,
+                 present: np.ndarray,
+                 payoff_index: np.ndarray,
+                 number_of_liabilities: int):
+        self.household_ids = household_ids
+        self.columns = columns
+        self.values = values
+        self.present = present
+        self.payoff_index = payoff_index # Households x liabilities; forecast length means not paid off
+        self.number_of_liabilities = number_of_liabilities
+
+    def household(self, household_id) -> SimulationResult:
+        """
+        One household's forecast over just its own accounts.
+        """
+        index = self.household_ids.index(household_id)
+        columns = np.flatnonzero(self.present[index])
+        forecast_length = self.values.shape[1] - 1
+        payoff_month = {self.columns[1 + liability]: (int(month) + 1 if month < forecast_length else None)
+                        for liability, month in enumerate(self.payoff_index[index])
+                        if self.present[index, 1 + liability]}
+        return SimulationResult([self.columns[column] for column in columns], self.values[index][:, columns], payoff_month)
+
+    def to_long_frame(self, start_month: int) -> "pd.DataFrame":
+        """
+        One row per household, month and account the household has, with columns
+        Household_Id, Date ("MM-YYYY"), Account and Balance.
+
+        Parameters:
+        - start_month: Month number (see utilities.months) of row 0.
+        """
+        return self._long_frame(slice(0, len(self.household_ids)), start_month)
+
+    def iter_long_frames(self, start_month: int, households_per_chunk: int = 100):
+        """
+        to_long_frame a block of households at a time, for utilities.sinks.stream_to_sinks.
+        """
+        for first in range(0, len(self.household_ids), households_per_chunk):
+            yield self._long_frame(slice(first, first + households_per_chunk), start_month)
+
+    def payoff_frame(self, start_month: int) -> "pd.DataFrame":
+        """
+        Household_Id, Account and Payoff_Date ("MM-YYYY", or None if not paid off in the forecast)
+        for every liability each household has.
+        """
+        import pandas as pd
+        households, liabilities = np.nonzero(self.present[:, 1:1 + self.number_of_liabilities])
+        payoff_index = self.payoff_index[households, liabilities]
+        forecast_length = self.values.shape[1] - 1
+        labels = MonthCalendar(start_month, forecast_length + 1).labels
+        return pd.DataFrame({
+            "Household_Id": np.asarray(self.household_ids, dtype=object)[households],
+            "Account": np.asarray(self.columns, dtype=object)[1 + liabilities],
+            "Payoff_Date": np.where(payoff_index < forecast_length, labels[np.minimum(payoff_index + 1, forecast_length)], None),
+        })
+
+    def _long_frame(self, households: slice, start_month: int) -> "pd.DataFrame":
+        import pandas as pd
+        values = self.values[households]
+        present = np.broadcast_to(self.present[households][:, None, :], values.shape)
+        household, month, column = np.nonzero(present)
+        dates = MonthCalendar(start_month, values.shape[1]).labels
+        return pd.DataFrame({
+            "Household_Id": np.asarray(self.household_ids[households], dtype=object)[household],
+            "Date": pd.Categorical.from_codes(month, dates),
+            "Account": pd.Categorical.from_codes(column, self.columns),
+            "Balance": values[household, month, column],
+        })
+
+
+class HouseholdBatch:
+    """
+    Forecasts many households at once by stacking them along a leading axis.
+
+    Each household keeps its own accounts; the batch lays them out over the union of every
+    account name, with missing accounts held at zero balance, zero rate and zero flow so they
+    never move, and masked out of the results. One call to
+    utilities.simulation.advance_accounts then advances every household in a block together.
+    """
+
+    def __init__(self, forecast_length: int):
+        self.forecast_length = forecast_length
+        self.household_ids = []
+        self.simulations = []
+
+    def __len__(self):
+        return len(self.household_ids)
+
+    def add_household(self, household_id, simulation: Simulation):
+        if simulation.forecast_length != self.forecast_length:
+            raise ValueError(f"Household '{household_id}' has a {simulation.forecast_length} month forecast; "
+                             f"the batch forecasts {self.forecast_length} months.")
+        if household_id in self.household_ids:
+            raise ValueError(f"Household '{household_id}' is already registered.")
+        unknown = [name for name in simulation.liability_redirects
+                   if name is not None and name not in simulation.asset_names]
+        if unknown:
+            raise ValueError(f"Household '{household_id}' redirects loan payments to unregistered accounts: {unknown}")
+        self.household_ids.append(household_id)
+        self.simulations.append(simulation)
+
+    def add_portfolio(self, household_id, portfolio):
+        """
+        Parameters:
+        - portfolio: utilities.portfolio.Portfolio of the household's incomes and accounts.
+        """
+        self.add_household(household_id, portfolio.to_simulation(self.forecast_length))
+
+    @classmethod
+    def from_portfolios(cls, portfolios: dict, forecast_length: int):
+        """
+        Batch of utilities.portfolio.Portfolio objects keyed by household id.
+        """
+        batch = cls(forecast_length)
+        for household_id, portfolio in portfolios.items():
+            batch.add_portfolio(household_id, portfolio)
+        return batch
+
+    def run(self, households_per_block: int = 1000) -> HouseholdBatchResult:
+        """
+        Parameters:
+        - households_per_block: Households advanced together; bounds the size of the
+          households x months x accounts working arrays.
+        """
+        liability_names = _union(simulation.liability_names for simulation in self.simulations)
+        asset_names = _union(simulation.asset_names for simulation in self.simulations)
+        columns = ["Total_Wealth"] + liability_names + asset_names
+        number_of_liabilities = len(liability_names)
+
+        values = np.zeros((len(self), self.forecast_length + 1, len(columns)))
+        present = np.zeros((len(self), len(columns)), dtype=bool)
+        present[:, 0] = True
+        payoff_index = np.empty((len(self), number_of_liabilities), dtype=int)
+        with instrumentation.span("households.run"):
+            for first in range(0, len(self), households_per_block):
+                block = slice(first, min(first + households_per_block, len(self)))
+                inputs = self._stack(self.simulations[block], liability_names, asset_names, present[block, 1:])
+                liabilities, assets, _, payoff_index[block] = advance_accounts(*inputs)
+                values[block, 0, 1:] = np.concatenate([inputs[0], inputs[4]], axis=-1)
+                values[block, 1:, 1:1 + number_of_liabilities] = liabilities
+                values[block, 1:, 1 + number_of_liabilities:] = assets
+                instrumentation.count("household_months", (block.stop - block.start) * self.forecast_length)
+        values[..., 0] = (values[..., 1 + number_of_liabilities:].sum(axis=-1)
+                          - values[..., 1:1 + number_of_liabilities].sum(axis=-1))
+        return HouseholdBatchResult(list(self.household_ids), columns, values, present, payoff_index, number_of_liabilities)
+
+    def _stack(self, simulations: list, liability_names: list, asset_names: list, present: np.ndarray):
+        # Scatter each household's accounts into the union layout; absent accounts stay zero
+        households = len(simulations)
+        months = self.forecast_length
+        liability_index = {name: index for index, name in enumerate(liability_names)}
+        asset_index = {name: index for index, name in enumerate(asset_names)}
+        liability_balances = np.zeros((households, len(liability_names)))
+        liability_rates = np.zeros((households, len(liability_names)))
+        payments = np.zeros((households, months, len(liability_names)))
+        redirect = np.zeros((households, len(liability_names), len(asset_names)))
+        asset_balances = np.zeros((households, len(asset_names)))
+        asset_rates = np.zeros((households, len(asset_names)))
+        contributions = np.zeros((households, months, len(asset_names)))
+
+        for household, simulation in enumerate(simulations):
+            liabilities = [liability_index[name] for name in simulation.liability_names]
+            assets = [asset_index[name] for name in simulation.asset_names]
+            present[household, liabilities] = True
+            present[household, [len(liability_names) + asset for asset in assets]] = True
+            liability_balances[household, liabilities] = simulation.liability_balances
+            liability_rates[household, liabilities] = simulation.liability_rates
+            asset_balances[household, assets] = simulation.asset_balances
+            asset_rates[household, assets] = simulation.asset_rates
+            if liabilities:
+                payments[household][:, liabilities] = np.column_stack(simulation.liability_payments)
+            if liabilities and assets:
+                redirect[household][np.ix_(liabilities, assets)] = simulation.redirect_matrix()
+            if assets:
+                contributions[household][:, assets] = np.column_stack(simulation.asset_contributions)
+        return (liability_balances, liability_rates, payments, redirect,
+                asset_balances, asset_rates, contributions)
+
+
+def _union(name_lists) -> list:
+    # Every name in first-seen order
+    names = {}
+    for name_list in name_lists:
+        names.update(dict.fromkeys(name_list))
+    return list(names)
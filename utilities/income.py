@@ -1,4 +1,10 @@
 class Income():
+
+    __slots__ = ("base_salary", "paycheck_non401k_pre_tax_deductions", "paycheck_schedule",
+                 "pre_tax_401k_contribution_rate", "_number_of_paychecks", "_paycheck_gross",
+                 "_paycheck_taxable_income")
+    TABLE_COLUMNS = {"base_salary": float, "paycheck_non401k_pre_tax_deductions": float,
+                     "paycheck_schedule": object, "pre_tax_401k_contribution_rate": float}
     
     def __init__(self,
                  base_salary:int,
@@ -11,10 +17,28 @@ class Income():
         self.paycheck_non401k_pre_tax_deductions = paycheck_non401k_pre_tax_deductions
         self.paycheck_schedule = paycheck_schedule
         self.pre_tax_401k_contribution_rate = pre_tax_401k_contribution_rate
-        self.paycheck_non401k_pre_tax_deductions = paycheck_non401k_pre_tax_deductions
-        self.number_of_paychecks = self.derive_number_of_paychecks()
-        self.paycheck_gross = self.derive_paycheck_gross()
-        self.paycheck_taxable_income = self.derive_paycheck_taxable_income()
+        # Derived paycheck figures are computed on first access and kept
+        self._number_of_paychecks = None
+        self._paycheck_gross = None
+        self._paycheck_taxable_income = None
+    
+    @property
+    def number_of_paychecks(self) -> int:
+        if self._number_of_paychecks is None:
+            self._number_of_paychecks = self.derive_number_of_paychecks()
+        return self._number_of_paychecks
+    
+    @property
+    def paycheck_gross(self) -> float:
+        if self._paycheck_gross is None:
+            self._paycheck_gross = self.derive_paycheck_gross()
+        return self._paycheck_gross
+    
+    @property
+    def paycheck_taxable_income(self) -> float:
+        if self._paycheck_taxable_income is None:
+            self._paycheck_taxable_income = self.derive_paycheck_taxable_income()
+        return self._paycheck_taxable_income
     
     def derive_number_of_paychecks(self):
         
@@ -29,13 +53,40 @@ class Income():
                     
     def derive_paycheck_gross(self):
         
-        paycheck_gross = self.base_salary / self.derive_number_of_paychecks()
+        paycheck_gross = self.base_salary / self.number_of_paychecks
         return paycheck_gross
     
     def derive_paycheck_taxable_income(self):
     
         return self.paycheck_gross - self.paycheck_non401k_pre_tax_deductions - (self.paycheck_gross * self.pre_tax_401k_contribution_rate)
     
-    def derive_paycheck_take_home(self):
-        
-        return self.paycheck_taxable_income * (1 - marginal_tax_rate)
\ No newline at end of file
+    def derive_paycheck_take_home(self,
+                                  tax_engine=None,
+                                  marginal_tax_rate: float = 0,
+                                  other_annual_taxable_income: float = 0):
+        # With a utilities.taxes.TaxEngine, withhold at the bracketed rate for this paycheck annualized;
+        # otherwise withhold a flat marginal_tax_rate. A joint filer is taxed together with
+        # the rest of the household's taxable pay, other_annual_taxable_income, and carries its share
+        if tax_engine is not None:
+            annual_taxable_income = self.paycheck_taxable_income * self.number_of_paychecks
+            annual_tax = tax_engine.household_annual_tax([annual_taxable_income, other_annual_taxable_income])[0]
+            return self.paycheck_taxable_income - float(annual_tax) / self.number_of_paychecks
+        return self.paycheck_taxable_income * (1 - marginal_tax_rate)
+
+
+def merge_incomes(existing: Income, addition: Income) -> Income:
+    """
+    Combine two incomes into one paid on `existing`'s schedule.
+
+    Salaries add. Per-paycheck deductions are annualized before being re-spread over the
+    combined paychecks, and the 401k rate is salary-weighted so contributed dollars are unchanged.
+    """
+    base_salary = existing.base_salary + addition.base_salary
+    annual_deductions = (existing.paycheck_non401k_pre_tax_deductions * existing.number_of_paychecks
+                         + addition.paycheck_non401k_pre_tax_deductions * addition.number_of_paychecks)
+    annual_401k = (existing.base_salary * existing.pre_tax_401k_contribution_rate
+                   + addition.base_salary * addition.pre_tax_401k_contribution_rate)
+    return Income(base_salary=base_salary,
+                  paycheck_non401k_pre_tax_deductions=annual_deductions / existing.number_of_paychecks,
+                  paycheck_schedule=existing.paycheck_schedule,
+                  pre_tax_401k_contribution_rate=annual_401k / base_salary if base_salary else 0)
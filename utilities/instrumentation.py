@@ -0,0 +1,131 @@
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+PROFILE_MODES = ("timing", "cprofile", "tracemalloc")
+
+
+class Instrumentation:
+    """
+    Named timing spans and counters for one forecast run, with optional cProfile and
+    tracemalloc capture.
+
+    Disabled by default: span() and count() then return immediately, so the calls can stay
+    in hot paths. Enable from the environment with WEALTH_FORECAST_PROFILE, a comma-separated
+    subset of timing, cprofile and tracemalloc ("1" means timing), or call enable() directly.
+
+    Parameters:
+    - modes: Iterable of PROFILE_MODES to turn on.
+    - output_path: Where summary() is written by emit_summary(); None writes to stderr.
+      The cProfile dump goes next to it as <name>.prof.
+    """
+
+    def __init__(self, modes=(), output_path: Path = None):
+        self.enabled = False
+        self.modes = set()
+        self.output_path = Path(output_path) if output_path is not None else None
+        self.reset()
+        if modes:
+            self.enable(modes)
+
+    @classmethod
+    def from_environment(cls):
+        modes = os.environ.get("WEALTH_FORECAST_PROFILE", "")
+        modes = ["timing" if mode.strip() == "1" else mode.strip() for mode in modes.split(",") if mode.strip()]
+        return cls(modes, os.environ.get("WEALTH_FORECAST_PROFILE_OUTPUT"))
+
+    def enable(self, modes=("timing",), output_path: Path = None):
+        unknown = set(modes) - set(PROFILE_MODES)
+        if unknown:
+            raise ValueError(f"Unknown profile modes {sorted(unknown)}. Use {', '.join(PROFILE_MODES)}.")
+        # Spans and counters are what the other modes are read against, so they are always on
+        self.modes = set(modes) | {"timing"}
+        self.enabled = True
+        if output_path is not None:
+            self.output_path = Path(output_path)
+        if "cprofile" in self.modes and self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if "tracemalloc" in self.modes and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        if self._profiler is not None:
+            self._profiler.disable()
+        if "tracemalloc" in self.modes and tracemalloc.is_tracing():
+            self._memory = tracemalloc.get_traced_memory()
+            self._top_allocations = tracemalloc.take_snapshot().statistics("lineno")[:10]
+            tracemalloc.stop()
+        self.enabled = False
+
+    def reset(self):
+        self.spans = {}
+        self.counters = {}
+        self._profiler = None
+        self._memory = None
+        self._top_allocations = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def span(self, name: str):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            calls, total, longest = self.spans.get(name, (0, 0.0, 0.0))
+            self.spans[name] = (calls + 1, total + elapsed, max(longest, elapsed))
+
+    def count(self, name: str, amount: int = 1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summary(self) -> dict:
+        summary = {"modes": sorted(self.modes),
+                   "wall_seconds": time.perf_counter() - self._started,
+                   "spans": {name: {"calls": calls, "total_seconds": total, "max_seconds": longest}
+                             for name, (calls, total, longest) in self.spans.items()},
+                   "counters": dict(self.counters)}
+        memory = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else self._memory
+        if memory is not None:
+            summary["memory"] = {"current_bytes": memory[0], "peak_bytes": memory[1],
+                                 "top_allocations": [{"location": str(statistic.traceback), "bytes": statistic.size,
+                                                      "blocks": statistic.count}
+                                                     for statistic in self._top_allocations]}
+        if self._profiler is not None:
+            summary["cprofile"] = self._profile_path()
+        return summary
+
+    def emit_summary(self):
+        """
+        Stop any profilers, then write summary() as JSON (and the cProfile dump, if captured).
+        """
+        if not self.enabled:
+            return None
+        self.disable()
+        summary = self.summary()
+        if self._profiler is not None:
+            self._profiler.dump_stats(summary["cprofile"])
+        if self.output_path is None:
+            print(json.dumps(summary), file=sys.stderr)
+        else:
+            with open(self.output_path, "w") as file:
+                json.dump(summary, file, indent=2)
+        return summary
+
+    def _profile_path(self) -> str:
+        if self.output_path is None:
+            return "wealth_forecast.prof"
+        return str(self.output_path.with_suffix(".prof"))
+
+
+# Shared instance used across utilities; configure with WEALTH_FORECAST_PROFILE or the --profile flag
+instrumentation = Instrumentation.from_environment()
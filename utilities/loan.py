@@ -1,4 +1,13 @@
+from datetime import datetime
+
 class Loan:
+
+    __slots__ = ("origination_date", "initial_upb", "interest_rate", "term", "current_upb",
+                 "one_time_prepayment", "recurring_prepayment")
+    # Constructor arguments stored per loan by utilities.tables.objects_to_table
+    TABLE_COLUMNS = {"initial_upb": float, "interest_rate": float, "term": int, "origination_date": object,
+                     "current_upb": float, "one_time_prepayment": float, "recurring_prepayment": float}
+
     def __init__(self, 
                 initial_upb: int,
                 interest_rate: float, 
@@ -9,7 +18,7 @@ class Loan:
                 recurring_prepayment=0):
         if origination_date is None:
             origination_date = datetime.now()
-        elif isinstance(origination_date, str) and len(origination_date) == 7:
+        elif isinstance(origination_date, str):
             try:
                 origination_date = datetime.strptime(origination_date, '%m-%Y')
             except ValueError:
@@ -20,4 +29,4 @@ class Loan:
         self.term = term
         self.current_upb = current_upb if current_upb is not None else initial_upb
         self.one_time_prepayment = one_time_prepayment
-        self.recurring_prepayment = recurring_prepayment
\ No newline at end of file
+        self.recurring_prepayment = recurring_prepayment
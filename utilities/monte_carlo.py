@@ -0,0 +1,115 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from utilities.instrumentation import instrumentation
+from utilities.months import MonthCalendar
+from utilities.simulation import Simulation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def draw_monthly_returns(rng: np.random.Generator,
+                         number_of_paths: int,
+                         number_of_months: int,
+                         annual_return: float,
+                         annual_volatility: float,
+                         method: str = "lognormal",
+                         history=None,
+                         dtype=np.float64) -> np.ndarray:
+    """
+    Draw a paths x months matrix of monthly equity returns.
+
+    Parameters:
+    - method: "normal" draws simple returns directly, "lognormal" draws log returns whose
+      mean simple return matches annual_return / 12, "bootstrap" resamples `history`.
+    - history: Sequence of observed monthly returns, required for "bootstrap".
+    """
+    shape = (number_of_paths, number_of_months)
+    monthly_return = annual_return / 12
+    monthly_volatility = annual_volatility / np.sqrt(12)
+
+    if method == "normal":
+        returns = rng.normal(monthly_return, monthly_volatility, size=shape)
+    elif method == "lognormal":
+        log_mean = np.log1p(monthly_return) - monthly_volatility ** 2 / 2
+        returns = np.expm1(rng.normal(log_mean, monthly_volatility, size=shape))
+    elif method == "bootstrap":
+        if history is None or len(history) == 0:
+            raise ValueError("Bootstrap sampling needs a history of monthly returns.")
+        returns = rng.choice(np.asarray(history, dtype=float), size=shape, replace=True)
+    else:
+        raise ValueError(f"Unknown return model '{method}'. Use normal, lognormal or bootstrap.")
+    return returns.astype(dtype, copy=False)
+
+
+class MonteCarloResult:
+    """
+    Percentile bands of Total_Wealth across simulated return paths. `bands` has one row
+    per requested percentile and one column per month (month 0 is the starting balance).
+    """
+
+    def __init__(self, percentiles: list, bands: np.ndarray, number_of_paths: int):
+        self.percentiles = percentiles
+        self.bands = bands
+        self.number_of_paths = number_of_paths
+
+    def to_frame(self, start_month: int) -> "pd.DataFrame":
+        import pandas as pd
+        dates = MonthCalendar(start_month, self.bands.shape[1]).labels
+        frame = pd.DataFrame(self.bands.T, columns=[f"Total_Wealth_p{p:g}" for p in self.percentiles])
+        frame.insert(0, "Date", dates)
+        return frame
+
+
+def simulate_wealth_bands(simulation: Simulation,
+                          equity_accounts: list,
+                          number_of_paths: int,
+                          annual_volatility: float,
+                          annual_return: float = None,
+                          method: str = "lognormal",
+                          history=None,
+                          percentiles: tuple = (5, 25, 50, 75, 95),
+                          chunk_size: int = 10000,
+                          dtype=np.float64,
+                          seed: int = None) -> MonteCarloResult:
+    """
+    Monte Carlo version of Simulation.run for the equity accounts.
+
+    Savings and liabilities stay deterministic. Every equity account shares the same market
+    return path, which lets their balances collapse into one column per path:
+    B[t] = G[t] * (B[0] + sum(flow[s] / G[s])). Paths are evaluated `chunk_size` at a time so
+    temporaries stay bounded; only the paths x months Total_Wealth matrix (in `dtype`) is kept.
+
+    Parameters:
+    - equity_accounts: Asset names in `simulation` that follow the simulated returns.
+    - annual_return: Mean annual return; defaults to the first equity account's rate.
+    - dtype: np.float32 halves memory for very large runs (100k paths x 600 months ~ 240MB).
+    """
+    deterministic = simulation.run()
+    equity_index = [simulation.asset_names.index(name) for name in equity_accounts]
+    if annual_return is None:
+        annual_return = simulation.asset_rates[equity_index[0]]
+
+    equity_columns = [deterministic.columns.index(name) for name in equity_accounts]
+    other_wealth = deterministic.values[:, 0] - deterministic.values[:, equity_columns].sum(axis=1)
+    equity_start = sum(simulation.asset_balances[index] for index in equity_index)
+    equity_flows = deterministic.asset_flows[:, equity_index].sum(axis=1).astype(dtype)
+
+    number_of_months = simulation.forecast_length
+    total_wealth = np.empty((number_of_paths, number_of_months + 1), dtype=dtype)
+    total_wealth[:, 0] = deterministic.values[0, 0]
+
+    instrumentation.count("monte_carlo.path_months", number_of_paths * number_of_months)
+    rng = np.random.default_rng(seed)
+    with instrumentation.span("monte_carlo.paths"):
+        for start in range(0, number_of_paths, chunk_size):
+            stop = min(start + chunk_size, number_of_paths)
+            returns = draw_monthly_returns(rng, stop - start, number_of_months, annual_return,
+                                           annual_volatility, method, history, dtype)
+            growth_index = np.cumprod(1 + returns, axis=1)
+            equity = growth_index * (equity_start + np.cumsum(equity_flows / growth_index, axis=1))
+            total_wealth[start:stop, 1:] = equity + other_wealth[1:].astype(dtype)
+
+    with instrumentation.span("monte_carlo.percentiles"):
+        bands = np.percentile(total_wealth, percentiles, axis=0, overwrite_input=True)
+    return MonteCarloResult(list(percentiles), bands, number_of_paths)
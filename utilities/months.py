@@ -0,0 +1,61 @@
+from datetime import datetime
+import numpy as np
+
+
+def month_number(date) -> int:
+    """
+    Convert an "MM-YYYY" string or datetime into a running month count (year * 12 + month - 1).
+    """
+    if isinstance(date, str):
+        month, year = date.split("-")
+        return int(year) * 12 + int(month) - 1
+    return date.year * 12 + date.month - 1
+
+
+def current_month() -> int:
+    return month_number(datetime.now())
+
+
+def month_label(month: int) -> str:
+    # Inverse of month_number
+    return f"{month % 12 + 1:02d}-{month // 12}"
+
+
+def month_labels(months) -> np.ndarray:
+    """
+    Vectorized month_label for an array of month numbers.
+    """
+    months = np.asarray(months, dtype=np.int64)
+    calendar_month = np.char.zfill((months % 12 + 1).astype(str), 2)
+    return np.char.add(np.char.add(calendar_month, "-"), (months // 12).astype(str)).astype(object)
+
+
+class MonthCalendar:
+    """
+    Month numbers for a forecast or schedule window starting at `start_month`.
+
+    Schedules and forecasts line up by integer offset (month - start_month), so lookups are
+    array indexing; "MM-YYYY" labels are only built when output asks for them.
+    """
+
+    def __init__(self, start_month: int, length: int):
+        self.start_month = int(start_month)
+        self.length = int(length)
+        self.months = np.arange(self.start_month, self.start_month + self.length)
+        self._labels = None
+
+    def __len__(self):
+        return self.length
+
+    def offset(self, month) -> int:
+        # Row of `month` in this window; works elementwise on arrays of month numbers too
+        return np.asarray(month) - self.start_month
+
+    def contains(self, month) -> bool:
+        return 0 <= month - self.start_month < self.length
+
+    @property
+    def labels(self) -> np.ndarray:
+        if self._labels is None:
+            self._labels = month_labels(self.months)
+        return self._labels
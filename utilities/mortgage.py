@@ -1,4 +1,20 @@
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+from utilities.loan import Loan
+from utilities.amortization import PMI_AUTOMATIC_LTV, PMI_REQUEST_LTV, amortize_batch, home_value_path, monthly_payment
+from utilities.instrumentation import instrumentation
+from utilities.months import current_month, month_label, month_labels, month_number
+from utilities.schedule_cache import schedule_cache, schedule_key
+from utilities.simulation import compound_balances
+
 class Mortgage(Loan):
+
+    __slots__ = ("monthly_escrow", "recorded_home_valuation", "monthly_pmi", "home_appreciation_rate",
+                 "pmi_drop_ltv", "_pmi", "_amortization_schedule", "_payoff_month", "_interest_saved",
+                 "_pmi_drop_month")
+    TABLE_COLUMNS = {**Loan.TABLE_COLUMNS, "monthly_escrow": float, "recorded_home_valuation": float,
+                     "monthly_pmi": float, "home_appreciation_rate": float, "pmi_drop_ltv": float}
     
     def __init__(self, 
                 initial_upb: int,
@@ -6,24 +22,91 @@ class Mortgage(Loan):
                 term: int, 
                 monthly_escrow: float,
                 origination_date: str, 
-                recorded_home_valuation = recorded_home_valuation,
+                recorded_home_valuation: float = None,
                 current_upb: int = None,
                 recurring_prepayment: int = 0,
-                one_time_prepayment: int = 0
+                one_time_prepayment: int = 0,
+                monthly_pmi: float = 0,
+                home_appreciation_rate: float = 0,
+                pmi_drop_ltv: float = PMI_AUTOMATIC_LTV
                 ):
         super().__init__(initial_upb=initial_upb, 
                          interest_rate=interest_rate,
                          term=term,
                          origination_date=origination_date,
                          current_upb=current_upb,
-                         one_time_prepayment=mortgage_one_time_prepayment,
-                         recurring_prepayment=recurring_mortgage_prepayment
+                         one_time_prepayment=one_time_prepayment,
+                         recurring_prepayment=recurring_prepayment
                         )
-        self.origination_date = self.convert_date_to_dt_obj(origination_date)
         self.monthly_escrow = monthly_escrow
-        self.recorded_valuation = recorded_home_valuation
-        self.pmi = self.calculate_monthly_pmi_payment()
-        self.amortization_schedule = self.calculate_amortization_schedule()
+        self.recorded_home_valuation = recorded_home_valuation
+        self.monthly_pmi = monthly_pmi
+        self.home_appreciation_rate = home_appreciation_rate # Annual, from recorded_home_valuation at origination
+        self.pmi_drop_ltv = pmi_drop_ltv
+        self._pmi = None # Derived on first access, see pmi
+        self._amortization_schedule = None # Built on first access, see amortization_schedule
+        self._payoff_month = None
+        self._interest_saved = None
+        self._pmi_drop_month = None # Projected on first access, see pmi_drop_month
+    
+    @property
+    def pmi(self) -> float:
+        if self._pmi is None:
+            self._pmi = self.calculate_monthly_pmi_payment()
+        return self._pmi
+    
+    @property
+    def amortization_schedule(self):
+        if self._amortization_schedule is None:
+            # The schedule and the figures read off it are memoized together, so they always agree
+            schedule, self._payoff_month, self._interest_saved, _ = self._cached_schedule()
+            self._amortization_schedule = schedule.copy()
+        return self._amortization_schedule
+    
+    @property
+    def payoff_month(self) -> int:
+        if self._payoff_month is None:
+            self.amortization_schedule
+        return self._payoff_month
+    
+    @property
+    def interest_saved(self) -> float:
+        if self._interest_saved is None:
+            self.amortization_schedule
+        return self._interest_saved
+    
+    @property
+    def pmi_drop_month(self) -> int:
+        """
+        Month number (see utilities.months) of the first payment without PMI, or None if the
+        loan carries no PMI from this month on.
+
+        Projected from current_upb this month along the path the forecast simulates: the
+        scheduled payment plus the recurring prepayment, with the one-time prepayment in the
+        first month.
+        """
+        if self._pmi_drop_month is None:
+            start_month = current_month()
+            key = schedule_key(projection="pmi_drop_month",
+                               initial_upb=self.initial_upb,
+                               interest_rate=self.interest_rate,
+                               term=self.term,
+                               current_upb=self.current_upb,
+                               monthly_pmi=self.monthly_pmi,
+                               recorded_home_valuation=self.recorded_home_valuation,
+                               home_appreciation_rate=self.home_appreciation_rate,
+                               pmi_drop_ltv=self.pmi_drop_ltv,
+                               origination_date=self.origination_date.strftime("%m-%Y"),
+                               recurring_prepayment=self.recurring_prepayment,
+                               one_time_prepayment=self.one_time_prepayment,
+                               start_month=month_label(start_month))
+            # -1 rather than None, which the cache reads as a miss
+            self._pmi_drop_month = schedule_cache.get_or_compute(key, lambda: self._project_pmi_drop_month(start_month))
+        return self._pmi_drop_month if self._pmi_drop_month >= 0 else None
+    
+    def export_amortization_schedule(self, file_path: Path = Path("mortgage_amortization.csv")):
+        
+        self.amortization_schedule.to_csv(file_path)
         
     def convert_date_to_dt_obj(self, date: str):
         
@@ -33,54 +116,138 @@ class Mortgage(Loan):
         
         return datetime.strftime("%m-%Y")
         
+    def _prepayment_plan(self, prepayment_this_month: int = 0):
+        # Prepayments only apply from the current month forward; earlier months already happened
+        one_time_prepayment = prepayment_this_month if prepayment_this_month > 0 else self.one_time_prepayment
+        if self.recurring_prepayment or one_time_prepayment:
+            current_payment_index = max(current_month() - month_number(self.origination_date), 0)
+            return one_time_prepayment, current_payment_index, month_label(month_number(self.origination_date) + current_payment_index)
+        # Without prepayments the schedule does not depend on when it is built, so its
+        # cache entry stays valid from one month to the next
+        return one_time_prepayment, 0, None
+        
     def calculate_amortization_schedule(self, prepayment_this_month: int = 0):
-        # Create Calculations for initial values
-        initial_upb_float = float(self.initial_upb)
-        monthly_interest_rate = self.interest_rate / 12
-        monthly_interest = monthly_interest_rate * initial_upb_float
-        base_principal_and_interest = (initial_upb_float * monthly_interest_rate) / (1- (1 + monthly_interest_rate) ** -self.term)
-        monthly_payment = base_principal_and_interest + self.pmi + self.monthly_escrow
-        principal_payment = monthly_payment - monthly_interest - self.pmi - self.monthly_escrow
-        remaining_balance = initial_upb_float - principal_payment
+        """
+        Amortization schedule, with `prepayment_this_month` in place of the one-time prepayment
+        when given. A what-if schedule leaves this loan's own schedule and figures untouched.
+        """
+        return self._cached_schedule(prepayment_this_month)[0].copy()
+    
+    def calculate_payoff(self, prepayment_this_month: int = 0) -> tuple:
+        """
+        (payoff_month, interest_saved) of calculate_amortization_schedule(prepayment_this_month).
+        """
+        _, payoff_month, interest_saved, _ = self._cached_schedule(prepayment_this_month)
+        return payoff_month, interest_saved
+    
+    def _cached_schedule(self, prepayment_this_month: int = 0) -> tuple:
+        # (schedule, payoff_month, interest_saved, pmi_drop_index); the schedule is the shared cached frame
+        one_time_prepayment, current_payment_index, prepayment_month = self._prepayment_plan(prepayment_this_month)
         
-        # Set up Dataframe with first row
-        amortization_schedule = pd.DataFrame(columns=['Month', 'Payment', 'Interest', 'Principal', 'UPB'])
-        amortization_schedule.loc[0] = [self.origination_date.strftime("%m-%Y"),
-                                        monthly_payment, 
-                                        monthly_interest, 
-                                        principal_payment, 
-                                        remaining_balance]
+        key = schedule_key(initial_upb=self.initial_upb,
+                           interest_rate=self.interest_rate,
+                           term=self.term,
+                           monthly_escrow=self.monthly_escrow,
+                           monthly_pmi=self.monthly_pmi,
+                           recorded_home_valuation=self.recorded_home_valuation,
+                           home_appreciation_rate=self.home_appreciation_rate,
+                           pmi_drop_ltv=self.pmi_drop_ltv,
+                           origination_date=self.origination_date.strftime("%m-%Y"),
+                           recurring_prepayment=self.recurring_prepayment,
+                           one_time_prepayment=one_time_prepayment,
+                           prepayment_month=prepayment_month)
+        return schedule_cache.get_or_compute(key, lambda: self._build_amortization_schedule(one_time_prepayment,
+                                                                                           current_payment_index))
+    
+    def _build_amortization_schedule(self, one_time_prepayment: float, current_payment_index: int):
+        # Vectorized schedule that stops at payoff, no per-row appends
+        import pandas as pd
+        instrumentation.count("schedules_built")
+        with instrumentation.span("mortgage.build_schedule"):
+            schedule, pmi, pmi_drop_index = self._amortize(one_time_prepayment, current_payment_index)
+        payoff_month = int(schedule.payoff_month[0])
+        interest_saved = float(schedule.interest_saved[0])
         
-        self.current_upb = remaining_balance
+        number_of_payments = payoff_month + 1
+        interest = schedule.interest[0, :number_of_payments]
+        principal = schedule.principal[0, :number_of_payments] + schedule.prepayment[0, :number_of_payments]
+        pmi = pmi[0, :number_of_payments]
+        months = month_labels(month_number(self.origination_date) + np.arange(number_of_payments))
         
-        next_month_date = self.origination_date # Bump this date for each iteration of loop
-        # Populate t+1...t+n table rows
-        for month in range(1, int(self.term) + 1):
-            # Calculations for t+1...t+n table rows
-            monthly_interest = monthly_interest_rate * self.current_upb 
-            principal_payment = base_principal_and_interest - monthly_interest
-            monthly_payment = base_principal_and_interest + self.pmi + self.monthly_escrow
-            remaining_balance = self.current_upb - principal_payment
-            
-            # Add to existing dataframe
-            amortization_schedule.loc[month] = [next_month_date.strftime("%m-%Y"),
-                                            monthly_payment, 
-                                            monthly_interest, 
-                                            principal_payment, 
-                                            remaining_balance]
-            # Update Current UPB
-            self.current_upb = remaining_balance
-            
-            # Increment the next month date for the next iteration
-            next_month_date += pd.DateOffset(months=1)
+        amortization_schedule = pd.DataFrame({'Month': months,
+                                              'Payment': interest + principal + pmi + self.monthly_escrow,
+                                              'Interest': interest,
+                                              'Principal': principal,
+                                              'PMI': pmi,
+                                              'UPB': schedule.balance[0, :number_of_payments]})
         
         amortization_schedule = amortization_schedule.round(2) ## Round pennies
-        amortization_schedule.to_csv("mortgage_amortization.csv")
-        return amortization_schedule
+        return amortization_schedule, payoff_month, interest_saved, int(pmi_drop_index[0])
+    
+    def _amortize(self, one_time_prepayment: float, current_payment_index: int):
+        # One-loan batch schedule plus its PMI charges and drop-off payment index
+        schedule = amortize_batch(initial_upb=[float(self.initial_upb)],
+                                  interest_rate=self.interest_rate,
+                                  term=int(self.term),
+                                  recurring_prepayment=self.recurring_prepayment,
+                                  one_time_prepayment=one_time_prepayment,
+                                  one_time_prepayment_month=current_payment_index,
+                                  prepayment_start_month=current_payment_index)
+        if self.recorded_home_valuation is None:
+            return schedule, np.zeros_like(schedule.balance), np.zeros(1, dtype=int)
+        home_value = home_value_path(self.recorded_home_valuation, self.home_appreciation_rate,
+                                     schedule.balance.shape[1])
+        pmi, pmi_drop_index = schedule.pmi(home_value[None, :], self.monthly_pmi, self.pmi_drop_ltv)
+        return schedule, pmi, pmi_drop_index
+    
+    def _project_pmi_drop_month(self, start_month: int) -> int:
+        instrumentation.count("schedules_built")
+        with instrumentation.span("mortgage.project_pmi"):
+            # Schedule index of the first forecast payment; index 0 is the origination month
+            first_index = start_month + 1 - month_number(self.origination_date)
+            number_of_payments = int(self.term) - first_index
+            if (self.recorded_home_valuation is None or not self.monthly_pmi or number_of_payments <= 0
+                    or self.initial_upb / self.recorded_home_valuation <= PMI_REQUEST_LTV):
+                return -1
+            payments = np.full(number_of_payments, float(monthly_payment(self.initial_upb, self.interest_rate, self.term))
+                               + self.recurring_prepayment)
+            if self.one_time_prepayment > 0:
+                payments[0] += self.one_time_prepayment - self.recurring_prepayment
+            closing = compound_balances([float(self.current_upb)], 1 + self.interest_rate / 12, -payments[:, None])[:, 0]
+            opening = np.concatenate([[float(self.current_upb)], closing[:-1]])
+            home_value = home_value_path(self.recorded_home_valuation, self.home_appreciation_rate, int(self.term))[first_index:]
+            dropped = opening / home_value <= self.pmi_drop_ltv
+        # Already at the threshold this month means PMI has been cancelled before the forecast starts
+        if dropped[0] or not dropped.any():
+            return -1
+        return start_month + 1 + int(dropped.argmax())
+    
+    def schedule_index(self, month: int) -> int:
+        """
+        Row of the amortization schedule for a month number (see utilities.months), or None
+        if the loan has no payment that month.
+        """
+        index = month - month_number(self.origination_date)
+        return index if 0 <= index <= self.payoff_month else None
+    
+    def balance_at_month(self, month: int) -> float:
+        """
+        UPB after the payment in `month` (a month number, see utilities.months), read off the
+        amortization schedule so prepayments are included; initial_upb before origination.
+        """
+        index = month - month_number(self.origination_date)
+        if index < 0:
+            return float(self.initial_upb)
+        if index > self.payoff_month:
+            return 0.0
+        return float(self.amortization_schedule['UPB'].iloc[index])
     
-    def calculate_monthly_pmi_payment(self):
-        if self.current_upb / self.recorded_valuation < 0.80:
-            pmi = monthly_pmi
-        else:
-            pmi = 0
-        return pmi
\ No newline at end of file
+    def calculate_monthly_pmi_payment(self, month: int = None) -> float:
+        """
+        PMI charged with the payment in `month` (a month number, default this month), read off
+        the amortization schedule's LTV path; 0 once it has dropped off or the loan is paid.
+        """
+        index = self.schedule_index(current_month() if month is None else month)
+        if index is None:
+            return 0.0
+        return float(self.amortization_schedule['PMI'].iloc[index])
\ No newline at end of file
@@ -0,0 +1,152 @@
+import numpy as np
+from utilities.months import current_month
+from utilities.tables import AccountTable
+from utilities.taxes import TaxEngine
+
+PAYCHECKS_PER_YEAR = {"biweekly": 26, "weekly": 52, "monthly": 12}
+CONTRIBUTION_BASES = ("gross", "take_home") # Pay a contribution percent is a share of
+
+
+class Payroll:
+    """
+    Months x incomes payroll arrays from IncomeTable.payroll. Amounts are monthly totals;
+    use per_paycheck() to read them per paycheck.
+    """
+
+    def __init__(self,
+                 names: list,
+                 paychecks_per_year: np.ndarray,
+                 gross: np.ndarray,
+                 pre_tax_deductions: np.ndarray,
+                 deferral: np.ndarray,
+                 employer_match: np.ndarray,
+                 taxes: np.ndarray):
+        self.names = names
+        self.paychecks_per_year = paychecks_per_year
+        self.gross = gross
+        self.pre_tax_deductions = pre_tax_deductions
+        self.deferral = deferral # Employee pre-tax 401k contribution
+        self.employer_match = employer_match
+        self.taxable = gross - pre_tax_deductions - deferral
+        self.taxes = taxes
+        self.take_home = self.taxable - taxes
+
+    def per_paycheck(self, values: np.ndarray) -> np.ndarray:
+        return values * 12 / self.paychecks_per_year
+
+    def contributions(self,
+                      fixed: np.ndarray,
+                      percent: np.ndarray,
+                      income_index: np.ndarray,
+                      take_home=False) -> np.ndarray:
+        """
+        Months x accounts contributions: a fixed monthly amount plus a share of the linked
+        income's pay that month. An income_index of -1 means no linked income.
+
+        Parameters:
+        - take_home: Per account, whether `percent` is a share of take-home pay (after
+          taxes, e.g. Roth or savings funding) instead of gross pay (e.g. 401k deferrals).
+        """
+        # Column -1 reads zeros
+        gross = np.hstack([self.gross, np.zeros((self.gross.shape[0], 1))])[:, income_index]
+        take_home_pay = np.hstack([self.take_home, np.zeros((self.take_home.shape[0], 1))])[:, income_index]
+        return fixed + percent * np.where(take_home, take_home_pay, gross)
+
+
+class IncomeTable(AccountTable):
+    """
+    Columnar store of incomes. payroll() derives gross pay, pre-tax deductions, 401k deferrals,
+    employer match, taxes and take-home for every income and month in one vectorized pass.
+
+    Salaries grow by `annual_raise` each year in calendar month `raise_month` (1-12), so a
+    forecast rerun next month still sees the raise in the same month. `base_salary` is the
+    salary before the next raise. Pre-tax deductions are per paycheck, as on a pay stub.
+    """
+
+    def __init__(self):
+        super().__init__(base_salary=float, paychecks_per_year=int, pre_tax_deductions=float,
+                         pre_tax_401k_rate=float, employer_match_rate=float, annual_raise=float,
+                         raise_month=int)
+
+    def add_income(self,
+                   name: str,
+                   base_salary: float,
+                   paycheck_schedule: str,
+                   pre_tax_deductions: float = 0,
+                   pre_tax_401k_rate: float = 0,
+                   employer_match_rate: float = 0,
+                   annual_raise: float = 0,
+                   raise_month: int = 1):
+        self.add_incomes([name], base_salary, [paycheck_schedule], pre_tax_deductions, pre_tax_401k_rate,
+                         employer_match_rate, annual_raise, raise_month)
+
+    def add_incomes(self,
+                    names: list,
+                    base_salary,
+                    paycheck_schedule,
+                    pre_tax_deductions=0,
+                    pre_tax_401k_rate=0,
+                    employer_match_rate=0,
+                    annual_raise=0,
+                    raise_month=1):
+        """
+        Bulk add_income; every argument after `names` is a scalar or one value per income.
+        """
+        schedules = np.broadcast_to(np.asarray(paycheck_schedule, dtype=object), (len(names),))
+        unknown = sorted({schedule for schedule in set(schedules) if schedule.lower() not in PAYCHECKS_PER_YEAR})
+        if unknown:
+            raise ValueError(f"Unknown paycheck schedule '{unknown[0]}'. Use weekly, biweekly or monthly.")
+        self.extend(names,
+                    base_salary=base_salary,
+                    paychecks_per_year=[PAYCHECKS_PER_YEAR[schedule.lower()] for schedule in schedules],
+                    pre_tax_deductions=pre_tax_deductions,
+                    pre_tax_401k_rate=pre_tax_401k_rate,
+                    employer_match_rate=employer_match_rate,
+                    annual_raise=annual_raise,
+                    raise_month=raise_month)
+
+    @classmethod
+    def from_incomes(cls, incomes: dict, employer_match_rate=0, annual_raise=0, raise_month=1):
+        """
+        Table of utilities.income.Income objects keyed by name.
+        """
+        table = cls()
+        table.extend(list(incomes),
+                     base_salary=[income.base_salary for income in incomes.values()],
+                     paychecks_per_year=[income.number_of_paychecks for income in incomes.values()],
+                     pre_tax_deductions=[income.paycheck_non401k_pre_tax_deductions for income in incomes.values()],
+                     pre_tax_401k_rate=[income.pre_tax_401k_contribution_rate for income in incomes.values()],
+                     employer_match_rate=employer_match_rate,
+                     annual_raise=annual_raise,
+                     raise_month=raise_month)
+        return table
+
+    def annual_salary(self, forecast_length: int, start_month: int = None) -> np.ndarray:
+        """
+        Months x incomes salary for the `forecast_length` months after `start_month` (a month
+        number, see utilities.months; defaults to this month).
+        """
+        start_month = current_month() if start_month is None else start_month
+        # Raises that have landed in (start_month, month], counted on the calendar
+        months = start_month + 1 + np.arange(forecast_length)[:, None]
+        raise_offset = self["raise_month"] - 1
+        raises = (months - raise_offset) // 12 - (start_month - raise_offset) // 12
+        return self["base_salary"] * (1 + self["annual_raise"]) ** raises
+
+    def payroll(self, forecast_length: int, tax_rate=0, start_month: int = None) -> Payroll:
+        """
+        Parameters:
+        - tax_rate: Flat rate on taxable pay (scalar or one per income), or a
+          utilities.taxes.TaxEngine to apply progressive brackets. The incomes are one
+          household, so a joint-filing engine taxes their combined pay.
+        - start_month: Month number the forecast starts from; payroll row 0 is the month after.
+        """
+        gross = self.annual_salary(forecast_length, start_month) / 12
+        pre_tax_deductions = np.broadcast_to(self["pre_tax_deductions"] * self["paychecks_per_year"] / 12, gross.shape)
+        deferral = gross * self["pre_tax_401k_rate"]
+        if isinstance(tax_rate, TaxEngine):
+            taxes = tax_rate.household_monthly_tax(gross - pre_tax_deductions - deferral)
+        else:
+            taxes = (gross - pre_tax_deductions - deferral) * np.asarray(tax_rate, dtype=float)
+        return Payroll(list(self.names), self["paychecks_per_year"], gross, pre_tax_deductions, deferral,
+                       gross * self["employer_match_rate"], taxes)
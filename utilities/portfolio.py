@@ -0,0 +1,343 @@
+import numpy as np
+from utilities.amortization import monthly_payment
+from utilities.config import InputValidationError, HouseholdInputs, PortfolioConfig, PortfolioInputs, TaxConfig
+from utilities.months import current_month
+from utilities.mortgage import Mortgage
+from utilities.payroll import CONTRIBUTION_BASES, IncomeTable, Payroll
+from utilities.simulation import Simulation
+from utilities.tables import AccountTable
+from utilities.taxes import tax_engine
+
+class Portfolio:
+    """
+    Registry of a household's incomes, savings accounts, equity accounts and loans.
+
+    Any number of each kind can be declared. Contributions tied to an income are resolved
+    for all accounts of a kind and every month at once from the income table's payroll,
+    so they follow salary growth and, for take-home funded accounts, taxes.
+
+    Parameters:
+    - tax_rate: Flat rate on taxable pay or a utilities.taxes.TaxEngine; see IncomeTable.payroll.
+    """
+
+    def __init__(self, tax_rate=0):
+        self.tax_rate = tax_rate
+        self.incomes = IncomeTable()
+        self.savings = AccountTable(balance=float, rate=float, monthly_contribution=float, first_month_contribution=float,
+                                    contribution_percent=float, income_index=int, take_home=bool)
+        self.equities = AccountTable(balance=float, rate=float, monthly_contribution=float, first_month_contribution=float,
+                                     contribution_percent=float, income_index=int, take_home=bool)
+        self.loans = AccountTable(balance=float, rate=float, monthly_payment=float,
+                                  recurring_prepayment=float, one_time_prepayment=float,
+                                  monthly_pmi=float, pmi_drop_month=int)
+        self.loan_redirects = []
+
+    def add_income(self,
+                   name: str,
+                   base_salary: float,
+                   paycheck_schedule: str,
+                   pre_tax_deductions: float = 0,
+                   pre_tax_401k_rate: float = 0,
+                   employer_match_rate: float = 0,
+                   annual_raise: float = 0,
+                   raise_month: int = 1):
+        self.incomes.add_income(name, base_salary, paycheck_schedule, pre_tax_deductions, pre_tax_401k_rate,
+                                employer_match_rate, annual_raise, raise_month)
+
+    def add_savings(self,
+                    name: str,
+                    balance: float,
+                    annual_rate: float,
+                    monthly_contribution: float = 0,
+                    income: str = None,
+                    contribution_percent: float = 0,
+                    contribution_basis: str = "gross",
+                    first_month_contribution: float = None):
+        """
+        contribution_percent is a share of `income`'s monthly pay, on top of monthly_contribution:
+        gross pay, or with contribution_basis="take_home" the pay left after taxes. A negative
+        monthly_contribution or contribution_percent withdraws from the account.
+
+        Parameters:
+        - first_month_contribution: Deposited in the first forecast month in place of
+          monthly_contribution (e.g. this month's actual deposit); None for the usual amount.
+        """
+        self.savings.add(name, balance=balance, rate=annual_rate, monthly_contribution=monthly_contribution,
+                         first_month_contribution=_missing_as_nan(first_month_contribution),
+                         contribution_percent=contribution_percent, income_index=self._income_index(income),
+                         take_home=self._is_take_home(contribution_basis))
+
+    def add_equity(self,
+                   name: str,
+                   balance: float,
+                   annual_return: float,
+                   monthly_contribution: float = 0,
+                   income: str = None,
+                   employee_contribution_pct: float = 0,
+                   employer_contribution_pct: float = 0,
+                   contribution_basis: str = "gross",
+                   first_month_contribution: float = None):
+        """
+        Percentages are shares of `income`'s gross pay (401k style), or of its take-home pay
+        with contribution_basis="take_home" (Roth style, funded after taxes).
+        first_month_contribution is as for add_savings.
+        """
+        self.equities.add(name, balance=balance, rate=annual_return, monthly_contribution=monthly_contribution,
+                          first_month_contribution=_missing_as_nan(first_month_contribution),
+                          contribution_percent=employee_contribution_pct + employer_contribution_pct,
+                          income_index=self._income_index(income), take_home=self._is_take_home(contribution_basis))
+
+    def add_loan(self,
+                 name: str,
+                 balance: float,
+                 annual_rate: float,
+                 monthly_payment: float,
+                 recurring_prepayment: float = 0,
+                 one_time_prepayment: float = 0,
+                 redirect_to: str = None,
+                 monthly_pmi: float = 0,
+                 pmi_drop_month: int = None):
+        """
+        Parameters:
+        - monthly_payment: Scheduled principal & interest payment.
+        - one_time_prepayment: Paid in the first forecast month in place of the recurring prepayment.
+        - redirect_to: Savings or equity account that receives the payment after payoff.
+        - monthly_pmi: PMI paid with the payment until pmi_drop_month (a month number, see
+          utilities.months; None if it never drops, e.g. Mortgage.pmi_drop_month). PMI does
+          not pay down the balance; from the drop month on the premium is freed cash flow
+          and goes to redirect_to like a paid-off payment.
+        """
+        self.loans.add(name, balance=balance, rate=annual_rate, monthly_payment=monthly_payment,
+                       recurring_prepayment=recurring_prepayment, one_time_prepayment=one_time_prepayment,
+                       monthly_pmi=monthly_pmi, pmi_drop_month=-1 if pmi_drop_month is None else pmi_drop_month)
+        self.loan_redirects.append(redirect_to)
+
+    def pmi_drop_month(self, loan: str) -> int:
+        """
+        Month number the loan's PMI drops off with, as given to add_loan; None if it never drops.
+        """
+        pmi_drop_month = int(self.loans["pmi_drop_month"][self.loans.index(loan)])
+        return pmi_drop_month if pmi_drop_month >= 0 else None
+
+    def payroll(self, forecast_length: int, tax_rate=None, start_month: int = None) -> Payroll:
+        # tax_rate defaults to the portfolio's own
+        return self.incomes.payroll(forecast_length, self.tax_rate if tax_rate is None else tax_rate, start_month)
+
+    def update_balances(self, balances):
+        """
+        Overwrite balances from a mapping of account name -> balance (e.g. the latest wealth row).
+        Names that are not registered are ignored.
+        """
+        for accounts in (self.savings, self.equities, self.loans):
+            for index, name in enumerate(accounts.names):
+                if name in balances:
+                    accounts["balance"][index] = balances[name]
+
+    def to_simulation(self, forecast_length: int, start_month: int = None) -> Simulation:
+        """
+        Parameters:
+        - start_month: Month number (see utilities.months) of the starting balances, which
+          places salary raises on the calendar; defaults to this month.
+        """
+        asset_names = self.savings.names + self.equities.names
+        unknown = [name for name in self.loan_redirects if name is not None and name not in asset_names]
+        if unknown:
+            raise ValueError(f"Loan payments redirected to unregistered accounts: {unknown}")
+
+        # Months x loans payment matrix; a one-time prepayment overrides the recurring one in month one
+        payments = np.tile(self.loans["monthly_payment"] + self.loans["recurring_prepayment"], (forecast_length, 1))
+        one_time = self.loans["one_time_prepayment"] > 0
+        payments[0, one_time] = (self.loans["monthly_payment"] + self.loans["one_time_prepayment"])[one_time]
+
+        # Months x loans PMI no longer charged, landing in each loan's redirect account
+        start_month = current_month() if start_month is None else start_month
+        months = start_month + 1 + np.arange(forecast_length)[:, None]
+        dropped = (self.loans["pmi_drop_month"] >= 0) & (months >= self.loans["pmi_drop_month"])
+        freed_pmi = np.where(dropped, self.loans["monthly_pmi"], 0.0)
+        redirect = np.array([[name == redirect_to for name in asset_names] for redirect_to in self.loan_redirects],
+                            dtype=float).reshape(len(self.loan_redirects), len(asset_names))
+        freed_pmi = freed_pmi @ redirect
+
+        # Months x accounts contributions, following each linked income's raises and taxes
+        payroll = self.payroll(forecast_length, start_month=start_month)
+        simulation = Simulation(forecast_length)
+        simulation.add_liabilities(self.loans.names, self.loans["balance"], self.loans["rate"],
+                                   payments.T, self.loan_redirects)
+        first_column = 0
+        for accounts in (self.savings, self.equities):
+            contributions = payroll.contributions(accounts["monthly_contribution"], accounts["contribution_percent"],
+                                                  accounts["income_index"], accounts["take_home"])
+            contributions = contributions + freed_pmi[:, first_column:first_column + len(accounts.names)]
+            first_month = ~np.isnan(accounts["first_month_contribution"])
+            if forecast_length and first_month.any():
+                contributions[0, first_month] += (accounts["first_month_contribution"]
+                                                  - accounts["monthly_contribution"])[first_month]
+            first_column += len(accounts.names)
+            simulation.add_assets(accounts.names, accounts["balance"], accounts["rate"], contributions.T)
+        return simulation
+
+    @classmethod
+    def from_inputs(cls, inputs):
+        """
+        Build from either parsed form returned by utilities.config.load_inputs.
+        """
+        if isinstance(inputs, PortfolioInputs):
+            return cls.from_config(inputs.portfolio, inputs.taxes)
+        return cls.from_household_inputs(inputs)
+
+    @classmethod
+    def from_config(cls, config: PortfolioConfig, taxes: TaxConfig = None):
+        portfolio = cls(_tax_rate(taxes))
+        errors = []
+        for entry in config.incomes:
+            try:
+                portfolio.add_income(entry.name, entry.base_salary, entry.paycheck_schedule,
+                                     entry.paycheck_non401k_pre_tax_deductions, entry.pre_tax_401k_contribution_rate,
+                                     entry.employer_match_rate, entry.annual_raise, entry.raise_month)
+            except ValueError as error:
+                errors.append(f"portfolio.incomes.{entry.name}: {error}")
+        for entry in config.savings:
+            try:
+                portfolio.add_savings(entry.name, entry.current_account_value, entry.current_account_interest_rate,
+                                      entry.monthly_contribution, entry.income, entry.contribution_percent,
+                                      entry.contribution_basis)
+            except ValueError as error:
+                errors.append(f"portfolio.savings.{entry.name}: {error}")
+        for entry in config.equities:
+            try:
+                portfolio.add_equity(entry.name, entry.current_acct_value, entry.average_return,
+                                     entry.monthly_contribution, entry.income,
+                                     entry.employee_contribution_pct, entry.employer_contribution_pct,
+                                     entry.contribution_basis)
+            except ValueError as error:
+                errors.append(f"portfolio.equities.{entry.name}: {error}")
+        for entry in config.loans:
+            try:
+                portfolio.add_loan(entry.name, entry.current_upb, entry.interest_rate, entry.monthly_payment,
+                                   entry.recurring_prepayment, entry.one_time_prepayment, entry.redirect_to)
+            except ValueError as error:
+                errors.append(f"portfolio.loans.{entry.name}: {error}")
+
+        asset_names = portfolio.savings.names + portfolio.equities.names
+        for name, redirect_to in zip(portfolio.loans.names, portfolio.loan_redirects):
+            if redirect_to is not None and redirect_to not in asset_names:
+                errors.append(f"portfolio.loans.{name}.redirect_to: no account named '{redirect_to}'")
+        if errors:
+            raise InputValidationError(errors)
+        return portfolio
+
+    @classmethod
+    def from_household_inputs(cls, inputs: HouseholdInputs):
+        """
+        Registry equivalent of the original fixed inputs.json layout. This is the one mapping
+        of that layout; the command line forecast and the HTTP service both run it.
+        """
+        portfolio = cls(_tax_rate(inputs.taxes))
+        income = inputs.income
+        active_401ks = inputs.investments.active_401ks
+        portfolio.add_income("Income_1", income.income_1_base_amount, income.income_1_pay_schedule,
+                             income.income_1_paycheck_non401k_pre_tax_deductions, active_401ks.income_1.employee_contribution_pct)
+        portfolio.add_income("Income_2", income.income_2_base_amount, income.income_2_pay_schedule,
+                             income.income_2_paycheck_non401k_pre_tax_deductions, active_401ks.income_2.employee_contribution_pct)
+
+        # Percent contributions and deductions come out of the linked income's take-home pay;
+        # this month's amounts, where given, replace the base ones in the first forecast month
+        errors = []
+        for name, section, account in [("Emergency_Savings", "account_1", inputs.savings.account_1),
+                                       ("Vacation_Savings", "account_2", inputs.savings.account_2),
+                                       ("CD", "cd", inputs.savings.cd)]:
+            percents = {"Income_1": (account.income1_base_monthly_contribution_percent
+                                     - account.income1_base_monthly_deduction_percent),
+                        "Income_2": (account.income2_base_monthly_contribution_percent
+                                     - account.income2_base_monthly_deduction_percent)}
+            linked = [income for income, percent_set in
+                      (("Income_1", account.income1_base_monthly_contribution_percent or account.income1_base_monthly_deduction_percent),
+                       ("Income_2", account.income2_base_monthly_contribution_percent or account.income2_base_monthly_deduction_percent))
+                      if percent_set]
+            if len(linked) > 1:
+                errors.append(f"savings.{section}: set contribution and deduction percents for income 1 or income 2, not both")
+            linked_income = linked[0] if linked else None
+            monthly_contribution = (account.income1_base_monthly_contribution - account.income1_base_monthly_deduction
+                                    + account.income2_base_monthly_contribution - account.income2_base_monthly_deduction)
+            first_month_contribution = ((account.income1_current_month_contribution or account.income1_base_monthly_contribution)
+                                        - (account.income1_current_month_deduction or account.income1_base_monthly_deduction)
+                                        + (account.income2_current_month_contribution or account.income2_base_monthly_contribution)
+                                        - (account.income2_current_month_deduction or account.income2_base_monthly_deduction))
+            portfolio.add_savings(name, account.current_account_value, account.current_account_interest_rate,
+                                  monthly_contribution, linked_income, percents.get(linked_income, 0),
+                                  contribution_basis="take_home", first_month_contribution=first_month_contribution)
+        if errors:
+            raise InputValidationError(errors)
+
+        average_return = inputs.investments.avg_equity_return
+        portfolio.add_equity("Income_1_IRA1", inputs.investments.iras.ira_1.current_acct_value, average_return,
+                             inputs.investments.iras.ira_1.current_monthly_contribution)
+        portfolio.add_equity("Income_1_401k", active_401ks.income_1.current_acct_value, average_return,
+                             income="Income_1", employee_contribution_pct=active_401ks.income_1.employee_contribution_pct,
+                             employer_contribution_pct=active_401ks.income_1.employer_contribution_pct)
+        portfolio.add_equity("Income_2_401k", active_401ks.income_2.current_acct_value, average_return,
+                             income="Income_2", employee_contribution_pct=active_401ks.income_2.employee_contribution_pct,
+                             employer_contribution_pct=active_401ks.income_2.employer_contribution_pct)
+        portfolio.add_equity("Income_2_IRA1", inputs.investments.iras.ira_2.current_acct_value, average_return,
+                             inputs.investments.iras.ira_2.current_monthly_contribution)
+        portfolio.add_equity("Brokerage_Account", inputs.investments.brokerage_acct_value, average_return)
+
+        mortgage = inputs.mortgage
+        # The amortization schedule's LTV path decides when PMI drops off
+        pmi_drop_month = Mortgage(initial_upb=mortgage.mortgage_initial_upb,
+                                  interest_rate=mortgage.mortgage_interest_rate,
+                                  term=mortgage.mortgage_length * 12,
+                                  monthly_escrow=mortgage.current_monthly_escrow,
+                                  origination_date=mortgage.mortgage_origination_date,
+                                  recorded_home_valuation=mortgage.recorded_home_valuation,
+                                  current_upb=mortgage.mortgage_current_upb,
+                                  recurring_prepayment=mortgage.recurring_mortgage_prepayment,
+                                  one_time_prepayment=mortgage.mortgage_one_time_prepayment,
+                                  monthly_pmi=mortgage.monthly_pmi,
+                                  home_appreciation_rate=mortgage.home_appreciation_rate,
+                                  pmi_drop_ltv=mortgage.pmi_drop_ltv).pmi_drop_month
+        portfolio.add_loan("Mortgage_UPB", mortgage.mortgage_current_upb, mortgage.mortgage_interest_rate,
+                           float(monthly_payment(mortgage.mortgage_initial_upb, mortgage.mortgage_interest_rate,
+                                                 mortgage.mortgage_length * 12)),
+                           mortgage.recurring_mortgage_prepayment, mortgage.mortgage_one_time_prepayment,
+                           redirect_to="Income_1_401k",
+                           monthly_pmi=mortgage.monthly_pmi if pmi_drop_month is not None else 0,
+                           pmi_drop_month=pmi_drop_month)
+        student_loans = inputs.student_loans
+        portfolio.add_loan("Student_Loan_UPB", student_loans.student_loan_current_upb, student_loans.student_loan_avg_interest_rate,
+                           float(monthly_payment(student_loans.student_loan_initial_upb, student_loans.student_loan_avg_interest_rate,
+                                                 student_loans.student_loan_term * 12)),
+                           student_loans.student_loan_recurring_prepayment, student_loans.student_loan_prepayment_this_month,
+                           redirect_to="Brokerage_Account")
+        car_loan = inputs.car_loan
+        portfolio.add_loan("Car_Loan", car_loan.car_loan_current_upb, car_loan.car_loan_interest_rate,
+                           float(monthly_payment(car_loan.car_loan_initial_upb, car_loan.car_loan_interest_rate,
+                                                 car_loan.car_loan_term_length)),
+                           car_loan.car_loan_recurring_prepayment, car_loan.car_loan_one_time_prepayment,
+                           redirect_to="Brokerage_Account")
+        return portfolio
+
+    def _is_take_home(self, contribution_basis: str) -> bool:
+        if contribution_basis not in CONTRIBUTION_BASES:
+            raise ValueError(f"Unknown contribution basis '{contribution_basis}'. Use {' or '.join(CONTRIBUTION_BASES)}.")
+        return contribution_basis == "take_home"
+
+    def _income_index(self, income: str) -> int:
+        if income is None:
+            return -1
+        if income not in self.incomes.names:
+            raise ValueError(f"No income named '{income}' is registered.")
+        return self.incomes.index(income)
+
+
+def _missing_as_nan(value) -> float:
+    return float("nan") if value is None else value
+
+
+def _tax_rate(taxes: TaxConfig):
+    # Progressive brackets when a filing status is given, otherwise the flat marginal rate
+    if taxes is None:
+        return 0
+    if taxes.filing_status is not None:
+        return tax_engine(taxes.filing_status, taxes.state)
+    return taxes.marginal_tax_rate
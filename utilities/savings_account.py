@@ -1,4 +1,23 @@
+from utilities.income import Income
+
 class SavingsAccount:
+
+    __slots__ = ("current_account_value", "current_account_interest_rate", "income_1", "income_2",
+                 "income1_base_monthly_contribution", "income1_base_monthly_deduction_percent",
+                 "income1_base_monthly_deduction", "income1_current_month_contribution",
+                 "income1_current_month_deduction", "income2_base_monthly_contribution",
+                 "income2_base_monthly_deduction_percent", "income2_base_monthly_deduction",
+                 "income2_current_month_contribution", "income2_current_month_deduction",
+                 "_current_month_net_contribution")
+    # Contribution percents are resolved to amounts at construction, so the table keeps the amounts
+    TABLE_COLUMNS = {"current_account_value": float, "current_account_interest_rate": float,
+                     "income_1": object, "income_2": object,
+                     "income1_base_monthly_contribution": float, "income1_base_monthly_deduction": float,
+                     "income1_base_monthly_deduction_percent": float, "income1_current_month_contribution": float,
+                     "income1_current_month_deduction": float,
+                     "income2_base_monthly_contribution": float, "income2_base_monthly_deduction": float,
+                     "income2_base_monthly_deduction_percent": float, "income2_current_month_contribution": float,
+                     "income2_current_month_deduction": float}
     
     def __init__(self, 
                  current_account_value: float,
@@ -20,8 +39,8 @@ class SavingsAccount:
         
         self.current_account_value = current_account_value
         self.current_account_interest_rate = current_account_interest_rate
-        self.income1 = income_1
-        self.income2 = income_2
+        self.income_1 = income_1
+        self.income_2 = income_2
         self.income1_base_monthly_contribution = self.set_income_base1_contribution(income1_base_monthly_contribution, income1_base_monthly_contribution_percent)
         self.income1_base_monthly_deduction_percent = income1_base_monthly_deduction_percent
         self.income1_base_monthly_deduction = income1_base_monthly_deduction
@@ -32,21 +51,27 @@ class SavingsAccount:
         self.income2_base_monthly_deduction = income2_base_monthly_deduction
         self.income2_current_month_contribution = income2_current_month_contribution
         self.income2_current_month_deduction = income2_current_month_deduction
-        self.current_month_net_contribution = self.calculate_current_month_net_contribution()
+        self._current_month_net_contribution = None # Derived on first access
+
+    @property
+    def current_month_net_contribution(self) -> float:
+        if self._current_month_net_contribution is None:
+            self._current_month_net_contribution = self.calculate_current_month_net_contribution()
+        return self._current_month_net_contribution
 
     def set_income_base1_contribution(self, income1_base_monthly_contribution, income1_base_monthly_contribution_percent):
         
         if income1_base_monthly_contribution_percent == 0:
             return income1_base_monthly_contribution
         else:
-            return self.income1.derive_paycheck_taxable_income() * income1_base_monthly_contribution_percent
+            return self.income_1.derive_paycheck_taxable_income() * income1_base_monthly_contribution_percent
         
     def set_income_base2_contribution(self, income2_base_monthly_contribution, income2_base_monthly_contribution_percent):
         
         if income2_base_monthly_contribution_percent == 0:
             return income2_base_monthly_contribution
         else:
-            return self.income2.derive_paycheck_taxable_income() * income2_base_monthly_contribution_percent
+            return self.income_2.derive_paycheck_taxable_income() * income2_base_monthly_contribution_percent
 
     def calculate_current_month_net_contribution(self):
     # Determine Income 1 Deduction for This Month
@@ -57,7 +82,7 @@ class SavingsAccount:
         
         # Determine Income 2 Contribution for This Month
         if self.income2_current_month_contribution != 0:
-            income2_contribution = self.self.income2_current_month_contribution
+            income2_contribution = self.income2_current_month_contribution
         else:
             income2_contribution = self.income2_base_monthly_contribution 
             
@@ -0,0 +1,144 @@
+import copy
+import itertools
+from typing import TYPE_CHECKING
+import numpy as np
+from utilities.config import parse_inputs
+from utilities.months import current_month, month_label
+from utilities.portfolio import Portfolio
+
+if TYPE_CHECKING:
+    import pandas as pd # Imported where results are tabulated
+
+# Arrays published by the parent process, attached once per worker by _attach_shared_arrays
+_shared_arrays = {}
+_shared_blocks = []
+
+
+def expand_grid(grid: dict) -> list:
+    """
+    Cartesian product of override values.
+
+    Parameters:
+    - grid: Dotted input path -> list of values, e.g. {"mortgage.recurring_mortgage_prepayment": [0, 500]}.
+    """
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def apply_overrides(base_inputs: dict, overrides: dict) -> dict:
+    """
+    Copy of `base_inputs` with each dotted path in `overrides` replaced.
+    """
+    inputs = copy.deepcopy(base_inputs)
+    for path, value in overrides.items():
+        *parents, leaf = path.split(".")
+        section = inputs
+        for key in parents:
+            section = section[key]
+        if leaf not in section:
+            raise KeyError(f"Override '{path}' does not match any input.")
+        section[leaf] = value
+    return inputs
+
+
+def evaluate_forecast(inputs: dict, shared_arrays: dict) -> "pd.DataFrame":
+    """
+    Default run_scenarios evaluator: the inputs' forecast from this month, as one row with
+    Final_Total_Wealth and a <liability>_Payoff_Date column per liability (None if it is
+    not paid off within the forecast). It rebuilds every schedule from `inputs` and does not
+    read `shared_arrays`, so run_scenarios does not publish them for it.
+    """
+    import pandas as pd
+    parsed = parse_inputs(inputs)
+    start_month = current_month()
+    result = Portfolio.from_inputs(parsed).to_simulation(parsed.forecast.forecast_length, start_month).run()
+    row = {"Final_Total_Wealth": result.values[-1, 0]}
+    for name, month in result.payoff_month.items():
+        row[f"{name}_Payoff_Date"] = month_label(start_month + month) if month is not None else None
+    return pd.DataFrame([row])
+
+
+def _publish_shared_arrays(arrays: dict):
+    # Copy each array into a shared memory block once; workers map it instead of unpickling a copy
+    from multiprocessing import shared_memory
+    blocks = {}
+    specs = {}
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+        blocks[name] = block
+        specs[name] = (block.name, array.shape, array.dtype.str)
+    return blocks, specs
+
+
+def _attach_shared_arrays(specs: dict):
+    from multiprocessing import shared_memory
+    for name, (block_name, shape, dtype) in specs.items():
+        # Pool workers share the parent's resource tracker, so the parent alone unlinks the block
+        block = shared_memory.SharedMemory(name=block_name)
+        _shared_blocks.append(block)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        _shared_arrays[name] = array
+
+
+def _evaluate_scenario(evaluate, scenario_id, base_inputs: dict, overrides: dict) -> "pd.DataFrame":
+    result = evaluate(apply_overrides(base_inputs, overrides), _shared_arrays)
+    result = result.copy()
+    for path, value in reversed(list(overrides.items())):
+        result.insert(0, path, value)
+    result.insert(0, "Scenario_ID", scenario_id)
+    return result
+
+
+def run_scenarios(base_inputs: dict,
+                  scenarios,
+                  evaluate=evaluate_forecast,
+                  shared_arrays: dict = None,
+                  max_workers: int = None) -> "pd.DataFrame":
+    """
+    Evaluate input variants across a process pool and return one consolidated table.
+
+    Parameters:
+    - base_inputs: Parsed inputs.json document.
+    - scenarios: List of override dicts, or a dict of scenario id -> override dict.
+      Use expand_grid to build a list from a parameter grid.
+    - evaluate: Module-level function (inputs: dict, shared_arrays: dict) -> DataFrame;
+      defaults to evaluate_forecast.
+    - shared_arrays: Immutable arrays (amortization schedules, return paths, ...) placed in
+      shared memory once and handed to every evaluation read-only, instead of pickled per task.
+      Only custom evaluators read them; with the default evaluate_forecast they are not published.
+    - max_workers: Process count; 0 evaluates in this process.
+
+    Rows are keyed by Scenario_ID, followed by one column per overridden input.
+    """
+    import pandas as pd
+    from concurrent.futures import ProcessPoolExecutor
+    if not isinstance(scenarios, dict):
+        scenarios = dict(enumerate(scenarios))
+    # The default evaluator never reads shared arrays, so skip copying them into shared memory
+    shared_arrays = shared_arrays if shared_arrays and evaluate is not evaluate_forecast else {}
+
+    if max_workers == 0:
+        _shared_arrays.update({name: np.asarray(array) for name, array in shared_arrays.items()})
+        try:
+            results = [_evaluate_scenario(evaluate, scenario_id, base_inputs, overrides)
+                       for scenario_id, overrides in scenarios.items()]
+        finally:
+            _shared_arrays.clear()
+        return pd.concat(results, ignore_index=True)
+
+    blocks, specs = _publish_shared_arrays(shared_arrays)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_attach_shared_arrays,
+                                 initargs=(specs,)) as executor:
+            futures = [executor.submit(_evaluate_scenario, evaluate, scenario_id, base_inputs, overrides)
+                       for scenario_id, overrides in scenarios.items()]
+            results = [future.result() for future in futures]
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+    return pd.concat(results, ignore_index=True)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import pickle
+from collections import OrderedDict
+from pathlib import Path
+from utilities.instrumentation import instrumentation
+
+
+def schedule_key(**loan_parameters) -> str:
+    """
+    Content-addressed key for an amortization schedule.
+
+    Parameters are serialized in sorted order, so the same loan terms always hash to the
+    same key regardless of argument order. Dates and other objects are keyed by str().
+    """
+    payload = json.dumps(loan_parameters, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScheduleCache:
+    """
+    Two-level cache for amortization schedules: an in-memory LRU in front of an optional
+    on-disk directory of pickled entries.
+
+    Parameters:
+    - max_entries: Number of schedules kept in memory before the least recently used is evicted.
+    - cache_dir: Directory for the on-disk layer. None keeps the cache memory-only.
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 cache_dir: Path = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            instrumentation.count("schedule_cache.hits")
+            return self._entries[key]
+
+        if self.cache_dir is not None:
+            path = self.cache_dir / f"{key}.pkl"
+            if path.exists():
+                with open(path, "rb") as file:
+                    value = pickle.load(file)
+                self._remember(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                instrumentation.count("schedule_cache.hits")
+                instrumentation.count("schedule_cache.disk_hits")
+                return value
+
+        self.misses += 1
+        instrumentation.count("schedule_cache.misses")
+        return None
+
+    def put(self, key: str, value):
+        self._remember(key, value)
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file and rename so concurrent readers never see a partial entry
+            temp_path = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.cache_dir / f"{key}.pkl")
+
+    def get_or_compute(self, key: str, compute):
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+        if self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.pkl"):
+                path.unlink()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "memory_entries": len(self._entries)}
+
+    def _remember(self, key: str, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Shared cache used by Mortgage; set WEALTH_FORECAST_CACHE_DIR to persist schedules between runs
+schedule_cache = ScheduleCache(cache_dir=os.environ.get("WEALTH_FORECAST_CACHE_DIR"))
@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from utilities.config import InputValidationError, parse_inputs
+from utilities.instrumentation import instrumentation
+from utilities.months import MonthCalendar, current_month, month_label
+from utilities.portfolio import Portfolio
+
+MAX_BODY_BYTES = 1024 * 1024
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error"}
+
+
+def request_key(document: dict, start_month: int) -> str:
+    # Key order and whitespace in the request do not change the forecast; the month it starts from does
+    canonical = json.dumps([start_month, document], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def forecast_document(document: dict, start_month: int = None) -> dict:
+    """
+    Forecast one inputs document (either layout accepted by utilities.config.parse_inputs)
+    as a JSON-ready dict. Runs in a worker, so it must stay picklable.
+
+    Parameters:
+    - start_month: Month number (see utilities.months) the forecast starts from; defaults to this month.
+    """
+    start_month = current_month() if start_month is None else start_month
+    inputs = parse_inputs(document)
+    forecast_length = inputs.forecast.forecast_length
+    result = Portfolio.from_inputs(inputs).to_simulation(forecast_length, start_month).run()
+    return {
+        "start_date": month_label(start_month),
+        "columns": result.columns,
+        "dates": MonthCalendar(start_month, forecast_length + 1).labels.tolist(),
+        "values": result.values.round(2).tolist(),
+        "payoff_dates": {name: (month_label(start_month + month) if month is not None else None)
+                         for name, month in result.payoff_month.items()},
+    }
+
+
+class TTLCache:
+    """
+    Least recently used mapping whose entries also expire `ttl` seconds after they are stored.
+
+    Parameters:
+    - ttl: Seconds an entry stays valid.
+    - max_entries: Oldest entries are evicted beyond this many.
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 256, clock=time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries = OrderedDict() # key -> (expires_at, value)
+
+    def __len__(self):
+        self._evict_expired()
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, value):
+        self.entries[key] = (self.clock() + self.ttl, value)
+        self.entries.move_to_end(key)
+        self._evict_expired()
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _evict_expired(self):
+        now = self.clock()
+        for key in [key for key, (expires_at, _) in self.entries.items() if expires_at <= now]:
+            del self.entries[key]
+
+
+class ForecastService:
+    """
+    Runs forecasts off the event loop for the HTTP endpoint.
+
+    Identical requests that arrive while one is being computed share that computation, and
+    finished forecasts are served from a TTL cache, so a burst of dashboard refreshes costs
+    one forecast. Failed forecasts are not cached.
+
+    Parameters:
+    - max_workers: Worker processes; 0 computes in one background thread of this process.
+    - ttl: Seconds a finished forecast is served from the cache.
+    - max_entries: Cached forecasts kept at most.
+    """
+
+    def __init__(self, max_workers: int = 0, ttl: float = 60.0, max_entries: int = 256):
+        self.cache = TTLCache(ttl, max_entries)
+        self.in_flight = {} # request key -> future of the running forecast
+        if max_workers == 0:
+            self.executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            # Forked workers would inherit open client sockets and hold connections open
+            self.executor = ProcessPoolExecutor(max_workers=max_workers,
+                                                mp_context=multiprocessing.get_context("forkserver"))
+
+    async def forecast(self, document: dict) -> dict:
+        # Forecasts move with the calendar, so a cached one is only reused within its month
+        start_month = current_month()
+        key = request_key(document, start_month)
+        cached = self.cache.get(key)
+        if cached is not None:
+            instrumentation.count("service.cache_hits")
+            return cached
+
+        future = self.in_flight.get(key)
+        if future is None:
+            instrumentation.count("service.computed")
+            future = asyncio.get_running_loop().run_in_executor(self.executor, forecast_document, document, start_month)
+            self.in_flight[key] = future
+            future.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            instrumentation.count("service.coalesced")
+        # A client that disconnects must not cancel the computation other requests are waiting on
+        return await asyncio.shield(future)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve one HTTP/1.1 request per connection:
+        - POST /forecast with an inputs document as the JSON body.
+        - GET /health.
+        """
+        try:
+            status, payload = await self._respond(reader)
+        except (ValueError, asyncio.IncompleteReadError):
+            status, payload = 400, {"error": "Malformed HTTP request."}
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1") + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def _respond(self, reader: asyncio.StreamReader):
+        method, path, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        content_length = int(headers.get("content-length", 0))
+        if content_length > MAX_BODY_BYTES:
+            return 413, {"error": f"Request body is larger than {MAX_BODY_BYTES} bytes."}
+        body = await reader.readexactly(content_length)
+
+        path = path.split("?", 1)[0]
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET /health."}
+            return 200, {"status": "ok", "cached": len(self.cache), "in_flight": len(self.in_flight)}
+        if path != "/forecast":
+            return 404, {"error": f"No endpoint at {path}."}
+        if method != "POST":
+            return 405, {"error": "Use POST /forecast with an inputs document as the JSON body."}
+        try:
+            document = json.loads(body)
+        except json.JSONDecodeError as error:
+            return 400, {"error": f"Body is not valid JSON: {error}"}
+        try:
+            return 200, await self.forecast(document)
+        except InputValidationError as error:
+            return 422, {"error": "Invalid inputs.", "errors": error.errors}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+
+    def _finish(self, key: str, future):
+        self.in_flight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+
+async def serve(host: str = "127.0.0.1",
+                port: int = 8000,
+                max_workers: int = 0,
+                ttl: float = 60.0,
+                max_entries: int = 256):
+    service = ForecastService(max_workers, ttl, max_entries)
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def run_service(host: str = "127.0.0.1",
+                port: int = 8000,
+                max_workers: int = 0,
+                ttl: float = 60.0,
+                max_entries: int = 256):
+    """
+    Blocking entry point for `python wealth_forecast.py --serve`; stops on Ctrl+C.
+    """
+    try:
+        asyncio.run(serve(host, port, max_workers, ttl, max_entries))
+    except KeyboardInterrupt:
+        pass
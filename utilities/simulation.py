@@ -0,0 +1,260 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from utilities.instrumentation import instrumentation
+from utilities.months import MonthCalendar, month_labels
+
+if TYPE_CHECKING:
+    import pandas as pd # Imported where a DataFrame is built, so the core path runs without it
+
+
+def compound_balances(initial_balance, monthly_growth, monthly_flow):
+    """
+    Solve B[t] = growth[t] * B[t-1] + flow[t] for every month and column at once.
+
+    Parameters:
+    - initial_balance: Starting balances, shape (..., columns).
+    - monthly_growth: Growth factors (1 + monthly rate), broadcastable to (..., months, columns).
+    - monthly_flow: Deposits (positive) or payments (negative) landing after growth, same shape.
+
+    Returns balances of shape (..., months, columns). Uses B[t] = G[t] * (B[0] + sum(flow[s] / G[s]))
+    with G the running product of growth, so there is no Python-level loop over months.
+    """
+    initial_balance = np.asarray(initial_balance, dtype=float)
+    monthly_flow = np.asarray(monthly_flow, dtype=float)
+    shape = np.broadcast_shapes(np.shape(monthly_growth), monthly_flow.shape, initial_balance.shape[:-1] + (1, initial_balance.shape[-1]))
+    growth_index = np.cumprod(np.broadcast_to(monthly_growth, shape), axis=-2)
+    flow = np.broadcast_to(monthly_flow, shape)
+    return growth_index * (initial_balance[..., None, :] + np.cumsum(flow / growth_index, axis=-2))
+
+
+def advance_accounts(liability_balances,
+                     liability_rates,
+                     payments,
+                     redirect,
+                     asset_balances,
+                     asset_rates,
+                     contributions):
+    """
+    Advance liabilities and assets over a block of months, redirecting each liability's payment
+    into an asset once it is paid off. Any leading axes (e.g. households) are carried through.
+
+    Parameters:
+    - liability_balances, liability_rates: Shape (..., liabilities); rates are annual.
+    - payments: Total monthly payment per liability, shape (..., months, liabilities).
+    - redirect: Shape (..., liabilities, assets), 1 where a paid-off payment flows into the asset.
+    - asset_balances, asset_rates: Shape (..., assets).
+    - contributions: Monthly deposits per asset, shape (..., months, assets).
+
+    Returns (liabilities, assets, asset_flows, payoff_index): balances of shape (..., months, columns),
+    asset deposits including freed payments, and the first month index each liability reaches
+    zero (the number of months if it never does).
+    """
+    payments = np.asarray(payments, dtype=float)
+    number_of_months = payments.shape[-2]
+    month_index = np.arange(number_of_months)[:, None]
+
+    # Liabilities: amortize along the unclamped path until it first crosses zero
+    unclamped = compound_balances(liability_balances,
+                                  1 + np.asarray(liability_rates, dtype=float)[..., None, :] / 12,
+                                  -payments)
+    crossed = unclamped <= 0
+    payoff_index = np.where(crossed.any(axis=-2), crossed.argmax(axis=-2), number_of_months)
+    before_payoff = month_index < payoff_index[..., None, :]
+    liabilities = np.where(before_payoff, unclamped, 0.0)
+
+    # Overpayment in the payoff month plus every later payment is freed cash flow
+    at_payoff = month_index == payoff_index[..., None, :]
+    freed = np.where(at_payoff, -unclamped, np.where(before_payoff, 0.0, payments))
+
+    asset_flows = contributions + freed @ redirect
+    assets = compound_balances(asset_balances,
+                               1 + np.asarray(asset_rates, dtype=float)[..., None, :] / 12,
+                               asset_flows)
+    return liabilities, assets, asset_flows, payoff_index
+
+
+class SimulationResult:
+    """
+    Month x column array of a forecast. Row 0 holds the starting balances and columns are
+    Total_Wealth, then liabilities, then assets in the order they were added.
+    """
+
+    def __init__(self, columns: list, values: np.ndarray, payoff_month: dict, asset_flows: np.ndarray = None):
+        self.columns = columns
+        self.values = values
+        self.payoff_month = payoff_month
+        self.asset_flows = asset_flows # Month x asset deposits, including payments freed by payoffs
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[..., self.columns.index(name)]
+
+    def to_frame(self, start_month: int) -> "pd.DataFrame":
+        """
+        Materialize the result as a DataFrame with a leading "MM-YYYY" Date column.
+
+        Parameters:
+        - start_month: Month number (see utilities.months) of row 0.
+        """
+        import pandas as pd
+        dates = MonthCalendar(start_month, self.values.shape[0]).labels
+        frame = pd.DataFrame(self.values, columns=self.columns)
+        frame.insert(0, "Date", dates)
+        return frame
+
+
+class Simulation:
+    """
+    Array-backed monthly forecast of a set of assets and liabilities.
+
+    Each account is a column of a preallocated array. Liabilities accrue interest and are
+    paid down until payoff; after payoff their payment is redirected into an asset so the
+    household keeps saving the same cash flow.
+    """
+
+    def __init__(self, forecast_length: int):
+        self.forecast_length = forecast_length
+        self.asset_names = []
+        self.asset_balances = []
+        self.asset_rates = []
+        self.asset_contributions = []
+        self.liability_names = []
+        self.liability_balances = []
+        self.liability_rates = []
+        self.liability_payments = []
+        self.liability_redirects = []
+
+    def add_asset(self,
+                  name: str,
+                  balance: float,
+                  annual_rate: float,
+                  monthly_contribution=0):
+        self.asset_names.append(name)
+        self.asset_balances.append(float(balance))
+        self.asset_rates.append(float(annual_rate))
+        self.asset_contributions.append(self._monthly_vector(monthly_contribution))
+
+    def add_liability(self,
+                      name: str,
+                      balance: float,
+                      annual_rate: float,
+                      monthly_payment,
+                      redirect_to: str = None):
+        """
+        Parameters:
+        - monthly_payment: Scalar or per-month array of the total payment (interest + principal + prepayment).
+        - redirect_to: Asset that receives the payment once the liability is paid off.
+        """
+        self.liability_names.append(name)
+        self.liability_balances.append(float(balance))
+        self.liability_rates.append(float(annual_rate))
+        self.liability_payments.append(self._monthly_vector(monthly_payment))
+        self.liability_redirects.append(redirect_to)
+
+    def add_assets(self, names: list, balances, annual_rates, monthly_contributions):
+        # Bulk registration for a whole table of accounts of one kind
+        for name, balance, annual_rate, contribution in zip(names, balances, annual_rates, monthly_contributions):
+            self.add_asset(name, balance, annual_rate, contribution)
+
+    def add_liabilities(self, names: list, balances, annual_rates, monthly_payments, redirects: list):
+        for name, balance, annual_rate, payment, redirect_to in zip(names, balances, annual_rates, monthly_payments, redirects):
+            self.add_liability(name, balance, annual_rate, payment, redirect_to)
+
+    def run(self) -> SimulationResult:
+        with instrumentation.span("simulation.run"):
+            liabilities, assets, asset_flows, payoff_index = self._advance(np.asarray(self.liability_balances),
+                                                                           np.asarray(self.asset_balances),
+                                                                           slice(0, self.forecast_length))
+        values = np.empty((self.forecast_length + 1, 1 + len(self.liability_names) + len(self.asset_names)))
+        values[0, 1:] = self.liability_balances + self.asset_balances
+        values[1:, 1:] = np.hstack([liabilities, assets])
+        values[:, 0] = self._total_wealth(values[:, 1:])
+
+        payoff_month = {name: (int(index) + 1 if index < self.forecast_length else None)
+                        for name, index in zip(self.liability_names, payoff_index)}
+        return SimulationResult(self.columns, values, payoff_month, asset_flows)
+
+    def iter_chunks(self, chunk_months: int = 12):
+        """
+        Advance the forecast `chunk_months` at a time, yielding (first month, values) pairs.
+
+        `values` has the same columns as run() and one row per month in the chunk; the
+        starting balances come first as month 0. Only one chunk is held in memory at a time.
+        """
+        liability_balances = np.asarray(self.liability_balances)
+        asset_balances = np.asarray(self.asset_balances)
+        start_row = np.concatenate([liability_balances, asset_balances])
+        yield 0, np.concatenate([[self._total_wealth(start_row)], start_row])[None, :]
+
+        for first_month in range(0, self.forecast_length, chunk_months):
+            months = slice(first_month, min(first_month + chunk_months, self.forecast_length))
+            liabilities, assets, _, _ = self._advance(liability_balances, asset_balances, months)
+            values = np.empty((liabilities.shape[0], len(self.columns)))
+            values[:, 1:] = np.hstack([liabilities, assets])
+            values[:, 0] = self._total_wealth(values[:, 1:])
+            # Paid-off liabilities carry forward at zero, so their payment keeps being redirected
+            liability_balances = liabilities[-1]
+            asset_balances = assets[-1]
+            yield first_month + 1, values
+
+    def iter_frames(self, start_month: int, chunk_months: int = 12):
+        """
+        DataFrame version of iter_chunks with the "MM-YYYY" Date column, for streaming sinks.
+        """
+        import pandas as pd
+        for first_month, values in self.iter_chunks(chunk_months):
+            dates = month_labels(start_month + first_month + np.arange(values.shape[0]))
+            frame = pd.DataFrame(values, columns=self.columns)
+            frame.insert(0, "Date", dates)
+            yield frame
+
+    def subset(self, names: list):
+        """
+        Simulation over just the named accounts, sharing their inputs with this one. Redirect
+        targets of included liabilities must be included too.
+        """
+        simulation = Simulation(self.forecast_length)
+        for index, name in enumerate(self.liability_names):
+            if name in names:
+                simulation.add_liability(name, self.liability_balances[index], self.liability_rates[index],
+                                         self.liability_payments[index], self.liability_redirects[index])
+        for index, name in enumerate(self.asset_names):
+            if name in names:
+                simulation.add_asset(name, self.asset_balances[index], self.asset_rates[index],
+                                     self.asset_contributions[index])
+        return simulation
+
+    @property
+    def columns(self) -> list:
+        return ["Total_Wealth"] + self.liability_names + self.asset_names
+
+    def _advance(self, liability_balances: np.ndarray, asset_balances: np.ndarray, months: slice):
+        number_of_months = months.stop - months.start
+        instrumentation.count("months_simulated", number_of_months)
+        number_of_liabilities = len(self.liability_names)
+        number_of_assets = len(self.asset_names)
+
+        if number_of_liabilities:
+            payments = np.column_stack(self.liability_payments)[months]
+        else:
+            payments = np.zeros((number_of_months, 0))
+        if number_of_assets:
+            contributions = np.column_stack(self.asset_contributions)[months]
+        else:
+            contributions = np.zeros((number_of_months, 0))
+        return advance_accounts(liability_balances, np.asarray(self.liability_rates), payments,
+                                self.redirect_matrix(), asset_balances, np.asarray(self.asset_rates), contributions)
+
+    def redirect_matrix(self) -> np.ndarray:
+        # Liabilities x assets; 1 where a paid-off liability's payment flows into the asset
+        redirect = np.zeros((len(self.liability_names), len(self.asset_names)))
+        for liability, asset in enumerate(self.liability_redirects):
+            if asset is not None:
+                redirect[liability, self.asset_names.index(asset)] = 1.0
+        return redirect
+
+    def _total_wealth(self, balances: np.ndarray) -> np.ndarray:
+        number_of_liabilities = len(self.liability_names)
+        return balances[..., number_of_liabilities:].sum(axis=-1) - balances[..., :number_of_liabilities].sum(axis=-1)
+
+    def _monthly_vector(self, value) -> np.ndarray:
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.forecast_length,))
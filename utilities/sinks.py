@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+from utilities.instrumentation import instrumentation
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class CsvSink:
+    """
+    Appends forecast chunks to a CSV file, writing the header with the first chunk.
+    """
+
+    def __init__(self, file_path: Path, float_format: str = "%.2f"):
+        self.file = open(file_path, "w", newline="")
+        self.float_format = float_format
+        self.header_written = False
+
+    def write(self, frame: "pd.DataFrame"):
+        frame.to_csv(self.file, header=not self.header_written, index=False, float_format=self.float_format)
+        self.header_written = True
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesSink:
+    """
+    Appends forecast chunks as one JSON object per month.
+    """
+
+    def __init__(self, file_path: Path):
+        self.file = open(file_path, "w")
+
+    def write(self, frame: "pd.DataFrame"):
+        self.file.write(frame.to_json(orient="records", lines=True).rstrip("\n") + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetSink:
+    """
+    Appends forecast chunks as row groups of a Parquet file. Requires pyarrow.
+    """
+
+    def __init__(self, file_path: Path):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetSink requires pyarrow. Install it with `pip install pyarrow`.")
+        self.pyarrow = pyarrow
+        self.file_path = file_path
+        self.writer = None
+
+    def write(self, frame: "pd.DataFrame"):
+        table = self.pyarrow.Table.from_pandas(frame, preserve_index=False)
+        if self.writer is None:
+            self.writer = self.pyarrow.parquet.ParquetWriter(self.file_path, table.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class CallbackSink:
+    """
+    Hands each chunk to a callable, e.g. a queue feeding a downstream consumer.
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def write(self, frame: "pd.DataFrame"):
+        self.callback(frame)
+
+    def close(self):
+        pass
+
+
+def stream_to_sinks(chunks, sinks: list) -> int:
+    """
+    Write every chunk from a forecast generator to each sink, closing the sinks at the end.
+    Returns the number of rows written.
+    """
+    rows_written = 0
+    try:
+        for frame in chunks:
+            with instrumentation.span("sinks.write"):
+                for sink in sinks:
+                    sink.write(frame)
+            rows_written += len(frame)
+            instrumentation.count("rows_written", len(frame))
+    finally:
+        for sink in sinks:
+            sink.close()
+    return rows_written
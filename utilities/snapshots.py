@@ -0,0 +1,141 @@
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING
+import numpy as np
+from utilities.months import month_labels, month_number
+
+if TYPE_CHECKING:
+    import pandas as pd # Imported where a DataFrame is read or written
+
+
+class NumpySnapshotStore:
+    """
+    Append-only history of wealth snapshots in a raw float64 file, read through np.memmap.
+
+    Every row is [month number, *balances] with a fixed width, so finding the latest snapshot
+    scans only the month column and column pruning is a strided view; nothing is parsed on
+    read. Rows may be appended out of month order. Column names live next to the data in
+    columns.json.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.data_path = self.directory / "snapshots.f64"
+        self.columns_path = self.directory / "columns.json"
+
+    @property
+    def columns(self) -> list:
+        if not self.columns_path.exists():
+            return None
+        with open(self.columns_path, "r") as file:
+            return json.load(file)
+
+    def __len__(self):
+        columns = self.columns
+        if columns is None or not self.data_path.exists():
+            return 0
+        return self.data_path.stat().st_size // (8 * (len(columns) + 1))
+
+    def append(self, snapshot: "pd.DataFrame"):
+        columns = [column for column in snapshot.columns if column != "Date"]
+        stored_columns = self.columns
+        if stored_columns is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(self.columns_path, "w") as file:
+                json.dump(columns, file)
+        elif stored_columns != columns:
+            raise ValueError(f"Snapshot columns {columns} do not match the stored history {stored_columns}.")
+
+        rows = np.empty((len(snapshot), len(columns) + 1), dtype=np.float64)
+        rows[:, 0] = [month_number(date) for date in snapshot["Date"]]
+        rows[:, 1:] = snapshot[columns].to_numpy(dtype=np.float64)
+        with open(self.data_path, "ab") as file:
+            file.write(rows.tobytes())
+
+    def read_history(self, columns: list = None) -> "pd.DataFrame":
+        return self._frame(columns)
+
+    def read_latest(self, columns: list = None) -> "pd.DataFrame":
+        return self._frame(columns, latest=True)
+
+    def _frame(self, columns: list = None, latest: bool = False) -> "pd.DataFrame":
+        import pandas as pd
+        number_of_rows = len(self)
+        if number_of_rows == 0:
+            return None
+        stored_columns = self.columns
+        history = np.memmap(self.data_path, dtype=np.float64, mode="r",
+                            shape=(number_of_rows, len(stored_columns) + 1))
+        rows = slice(None)
+        if latest:
+            # Latest month, and of several snapshots for it the last appended
+            last_row = number_of_rows - 1 - int(np.argmax(history[::-1, 0]))
+            rows = slice(last_row, last_row + 1)
+        columns = stored_columns if columns is None else columns
+        index = [stored_columns.index(column) + 1 for column in columns]
+
+        frame = pd.DataFrame(np.array(history[rows][:, index]), columns=columns)
+        frame.insert(0, "Date", month_labels(history[rows][:, 0]))
+        return frame
+
+
+class ParquetSnapshotStore:
+    """
+    Append-only history of wealth snapshots as one Parquet file per append. Requires pyarrow.
+
+    File names sort by the last month they hold and rows are sorted by month on write, so
+    the latest snapshot is the last row of the last file, opened without scanning the
+    history. Parquet's column projection handles pruning.
+    """
+
+    def __init__(self, directory: Path):
+        try:
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("ParquetSnapshotStore requires pyarrow. Install it with `pip install pyarrow`.")
+        self.parquet = pyarrow.parquet
+        self.directory = Path(directory)
+
+    def __len__(self):
+        return len(self._files())
+
+    def append(self, snapshot: "pd.DataFrame"):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        months = np.array([month_number(date) for date in snapshot["Date"]])
+        snapshot = snapshot.iloc[np.argsort(months, kind="stable")]
+        sequence = len(self._files())
+        file_path = self.directory / f"snapshot-{months.max():06d}-{sequence:06d}.parquet"
+        snapshot.to_parquet(file_path, index=False)
+
+    def read_history(self, columns: list = None) -> "pd.DataFrame":
+        import pandas as pd
+        files = self._files()
+        if not files:
+            return None
+        return pd.concat([self._read(file_path, columns) for file_path in files], ignore_index=True)
+
+    def read_latest(self, columns: list = None) -> "pd.DataFrame":
+        files = self._files()
+        if not files:
+            return None
+        return self._read(files[-1], columns).tail(1).reset_index(drop=True)
+
+    def _read(self, file_path: Path, columns: list = None) -> "pd.DataFrame":
+        columns = None if columns is None else ["Date"] + [column for column in columns if column != "Date"]
+        return self.parquet.read_table(file_path, columns=columns).to_pandas()
+
+    def _files(self) -> list:
+        return sorted(self.directory.glob("snapshot-*.parquet"))
+
+
+def open_snapshot_store(directory: Path, backend: str = "numpy"):
+    """
+    Parameters:
+    - directory: Folder holding the snapshot history.
+    - backend: "numpy" (memory-mapped, no extra dependency) or "parquet" (needs pyarrow).
+    """
+    if backend == "numpy":
+        return NumpySnapshotStore(directory)
+    elif backend == "parquet":
+        return ParquetSnapshotStore(directory)
+    raise ValueError(f"Unknown snapshot backend '{backend}'. Use numpy or parquet.")
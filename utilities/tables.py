@@ -0,0 +1,78 @@
+import numpy as np
+
+
+class AccountTable:
+    """
+    Struct-of-arrays storage for every account of one kind: one name list plus one typed
+    NumPy column per attribute, so per-kind updates are single vectorized operations.
+    """
+
+    def __init__(self, **column_dtypes):
+        self.names = []
+        self.columns = {column: np.empty(0, dtype=dtype) for column, dtype in column_dtypes.items()}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def add(self, name: str, **values):
+        self.extend([name], **{column: [value] for column, value in values.items()})
+
+    def extend(self, names: list, **columns):
+        """
+        Append many rows at once; each column is a sequence (or scalar) aligned with `names`.
+        """
+        names = list(names)
+        duplicates = self._duplicates(names)
+        if duplicates:
+            raise ValueError(f"Account '{duplicates[0]}' is already registered.")
+        self.names.extend(names)
+        for column, array in self.columns.items():
+            values = np.broadcast_to(np.asarray(columns[column], dtype=array.dtype), (len(names),))
+            self.columns[column] = np.concatenate([array, values])
+
+    def index(self, name: str) -> int:
+        return self.names.index(name)
+
+    def _duplicates(self, names: list) -> list:
+        seen = set(self.names)
+        duplicates = []
+        for name in names:
+            if name in seen:
+                duplicates.append(name)
+            seen.add(name)
+        return duplicates
+
+
+def objects_to_table(objects: list, names: list = None) -> AccountTable:
+    """
+    Struct-of-arrays copy of domain objects of one class (Loan, Mortgage, Income, SavingsAccount,
+    EquityInvestment, FourZeroOneKay or RothIRA): one column per entry of the class's
+    TABLE_COLUMNS, which are its constructor arguments.
+
+    Parameters:
+    - names: Row names; defaults to "0", "1", ...
+    """
+    columns = type(objects[0]).TABLE_COLUMNS
+    table = AccountTable(**columns)
+    table.extend(names if names is not None else [str(index) for index in range(len(objects))],
+                 **{column: [_missing_as_nan(getattr(item, column), dtype) for item in objects]
+                    for column, dtype in columns.items()})
+    return table
+
+
+def table_to_objects(table: AccountTable, object_class) -> list:
+    """
+    Inverse of objects_to_table: construct one `object_class` per row. NaN in a float
+    column becomes None again.
+    """
+    columns = {column: [None if value != value else value for value in table[column].tolist()]
+               if table[column].dtype.kind == "f" else table[column].tolist()
+               for column in object_class.TABLE_COLUMNS}
+    return [object_class(**dict(zip(columns, row))) for row in zip(*columns.values())]
+
+
+def _missing_as_nan(value, dtype):
+    return float("nan") if value is None and dtype is float else value
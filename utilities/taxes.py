@@ -0,0 +1,116 @@
+import numpy as np
+
+
+class TaxBrackets:
+    """
+    One progressive income tax schedule.
+
+    The tax owed at each bracket floor is precomputed, so tax on any array of incomes is one
+    np.searchsorted for the bracket plus base[bracket] + rate[bracket] * (income - floor).
+
+    Parameters:
+    - floors: Lower bound of each bracket in annual dollars, ascending, starting at 0.
+    - rates: Marginal rate of each bracket.
+    - standard_deduction: Subtracted from income before the brackets apply.
+    """
+
+    def __init__(self, floors, rates, standard_deduction: float = 0):
+        self.floors = np.asarray(floors, dtype=float)
+        self.rates = np.asarray(rates, dtype=float)
+        if self.floors.shape != self.rates.shape or self.floors[0] != 0 or np.any(np.diff(self.floors) <= 0):
+            raise ValueError("Bracket floors must start at 0, increase, and match the rates one to one.")
+        self.standard_deduction = float(standard_deduction)
+        self.base_tax = np.concatenate([[0.0], np.cumsum(np.diff(self.floors) * self.rates[:-1])])
+
+    def bracket(self, annual_income) -> np.ndarray:
+        return self._bracket(self._taxable(annual_income))
+
+    def annual_tax(self, annual_income) -> np.ndarray:
+        taxable = self._taxable(annual_income)
+        bracket = self._bracket(taxable)
+        return self.base_tax[bracket] + self.rates[bracket] * (taxable - self.floors[bracket])
+
+    def marginal_rate(self, annual_income) -> np.ndarray:
+        return self.rates[self.bracket(annual_income)]
+
+    def _taxable(self, annual_income) -> np.ndarray:
+        return np.maximum(np.asarray(annual_income, dtype=float) - self.standard_deduction, 0.0)
+
+    def _bracket(self, taxable: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.floors, taxable, side="right") - 1
+
+
+class TaxEngine:
+    """
+    Federal plus optional state brackets, applied to annualized taxable pay (after pre-tax
+    deductions and 401k deferrals).
+
+    Parameters:
+    - joint: Married filing jointly; household_annual_tax pools the household's incomes.
+    """
+
+    def __init__(self, federal: TaxBrackets, state: TaxBrackets = None, joint: bool = False):
+        self.jurisdictions = [brackets for brackets in (federal, state) if brackets is not None]
+        self.joint = joint
+
+    def annual_tax(self, annual_taxable_income) -> np.ndarray:
+        return sum(brackets.annual_tax(annual_taxable_income) for brackets in self.jurisdictions)
+
+    def monthly_tax(self, monthly_taxable_income) -> np.ndarray:
+        # Each month is taxed as if its pay continued all year, like paycheck withholding
+        return self.annual_tax(np.asarray(monthly_taxable_income, dtype=float) * 12) / 12
+
+    def household_annual_tax(self, annual_taxable_incomes) -> np.ndarray:
+        """
+        Tax on each income of one household, with the incomes on the last axis.
+
+        Joint filers are taxed once on the combined income (one standard deduction, one set
+        of brackets) and the tax is split across incomes in proportion to their pay. Other
+        filers are taxed on each income separately.
+        """
+        annual_taxable_incomes = np.asarray(annual_taxable_incomes, dtype=float)
+        if not self.joint:
+            return self.annual_tax(annual_taxable_incomes)
+        combined = annual_taxable_incomes.sum(axis=-1, keepdims=True)
+        share = np.divide(annual_taxable_incomes, combined, out=np.zeros_like(annual_taxable_incomes), where=combined > 0)
+        return self.annual_tax(combined) * share
+
+    def household_monthly_tax(self, monthly_taxable_incomes) -> np.ndarray:
+        return self.household_annual_tax(np.asarray(monthly_taxable_incomes, dtype=float) * 12) / 12
+
+    def marginal_rate(self, annual_taxable_income) -> np.ndarray:
+        return sum(brackets.marginal_rate(annual_taxable_income) for brackets in self.jurisdictions)
+
+    def effective_rate(self, annual_taxable_income) -> np.ndarray:
+        annual_taxable_income = np.asarray(annual_taxable_income, dtype=float)
+        tax = self.annual_tax(annual_taxable_income)
+        return np.divide(tax, annual_taxable_income, out=np.zeros_like(tax), where=annual_taxable_income > 0)
+
+
+# 2024 tax year
+FEDERAL_BRACKETS = {
+    "single": TaxBrackets([0, 11600, 47150, 100525, 191950, 243725, 609350],
+                          [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37],
+                          standard_deduction=14600),
+    "married_filing_jointly": TaxBrackets([0, 23200, 94300, 201050, 383900, 487450, 731200],
+                                          [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37],
+                                          standard_deduction=29200),
+    "head_of_household": TaxBrackets([0, 16550, 63100, 100500, 191950, 243700, 609350],
+                                     [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37],
+                                     standard_deduction=21900),
+}
+STATE_BRACKETS = {
+    "OH": TaxBrackets([0, 26050, 100000], [0.0, 0.0275, 0.035]),
+}
+
+
+def tax_engine(filing_status: str = "single", state: str = None) -> TaxEngine:
+    """
+    Engine for a built-in filing status (see FEDERAL_BRACKETS) and optional state code.
+    """
+    if filing_status not in FEDERAL_BRACKETS:
+        raise ValueError(f"Unknown filing status '{filing_status}'. Use {', '.join(FEDERAL_BRACKETS)}.")
+    if state is not None and state not in STATE_BRACKETS:
+        raise ValueError(f"No brackets for state '{state}'. Available: {', '.join(STATE_BRACKETS)}.")
+    return TaxEngine(FEDERAL_BRACKETS[filing_status], STATE_BRACKETS.get(state),
+                     joint=filing_status == "married_filing_jointly")